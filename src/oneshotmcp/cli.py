@@ -17,8 +17,10 @@ Usage:
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import os
 import shlex
+import threading
 from importlib.metadata import version as get_version
 from typing import Annotated, Literal, cast
 
@@ -32,6 +34,7 @@ from ._warnings import suppress_known_warnings
 suppress_known_warnings()
 
 from .config import HTTPServerSpec, ServerSpec, StdioServerSpec
+from .discovery_cache import DiscoveryCache
 from .orchestrator import DynamicOrchestrator
 
 load_dotenv()
@@ -39,6 +42,17 @@ load_dotenv()
 app = typer.Typer(add_completion=False)
 console = Console()
 
+# REPL commands that end the interactive session
+_EXIT_COMMANDS = frozenset({"exit", "quit"})
+
+
+def _split_block(block: str) -> list[str]:
+    """Split a block string into shell-style tokens (POSIX quoting, no comments)."""
+    lex = shlex.shlex(block, posix=True)
+    lex.whitespace_split = True
+    lex.commenters = ""
+    return list(lex)
+
 
 def _parse_kv(opts: list[str]) -> dict[str, str]:
     """Parse ['k=v', 'x=y', ...] into a dict. Values may contain spaces."""
@@ -51,6 +65,39 @@ def _parse_kv(opts: list[str]) -> dict[str, str]:
     return out
 
 
+async def _read_input(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+
+    The blocking ``input()`` call runs in a daemon thread so background tasks keep
+    running while the user types, and an abandoned read never delays interpreter exit.
+
+    Raises:
+        EOFError: If stdin is closed.
+        KeyboardInterrupt: If the read is interrupted.
+    """
+    loop = asyncio.get_running_loop()
+    fut: asyncio.Future[str] = loop.create_future()
+
+    def _deliver(line: str | None, exc: BaseException | None) -> None:
+        if fut.done():  # Reader was cancelled while waiting for input
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(line or "")
+
+    def _reader() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as exc:  # EOFError/KeyboardInterrupt are re-raised in the loop
+            loop.call_soon_threadsafe(_deliver, None, exc)
+        else:
+            loop.call_soon_threadsafe(_deliver, line, None)
+
+    threading.Thread(target=_reader, name="oneshot-input", daemon=True).start()
+    return await fut
+
+
 def _get_default_servers() -> dict[str, ServerSpec]:
     """Get default pre-configured servers from environment variables.
 
@@ -92,13 +139,13 @@ def _merge_servers(stdios: list[str], https: list[str]) -> dict[str, ServerSpec]
       "name=echo command=python args='-m mymod --port 3333' env.API_KEY=xyz cwd=/tmp keep_alive=false"
       "name=remote url=http://127.0.0.1:8000/mcp transport=http"
 
-    We first shlex-split the string into key=value tokens, then parse.
+    We first split the string (shell-style quoting) into key=value tokens, then parse.
     """
     servers: dict[str, ServerSpec] = {}
 
     # stdio (kept for completeness)
     for block_str in stdios:
-        tokens = shlex.split(block_str)
+        tokens = _split_block(block_str)
         kv = _parse_kv(tokens)
 
         name = kv.pop("name", None)
@@ -110,7 +157,7 @@ def _merge_servers(stdios: list[str], https: list[str]) -> dict[str, ServerSpec]
             raise typer.BadParameter("Missing required key: command (in --stdio block)")
 
         args_value = kv.pop("args", "")
-        args_list = shlex.split(args_value) if args_value else []
+        args_list = _split_block(args_value) if args_value else []
 
         env = {k.split(".", 1)[1]: v for k, v in list(kv.items()) if k.startswith("env.")}
         cwd = kv.get("cwd")
@@ -127,7 +174,7 @@ def _merge_servers(stdios: list[str], https: list[str]) -> dict[str, ServerSpec]
 
     # http
     for block_str in https:
-        tokens = shlex.split(block_str)
+        tokens = _split_block(block_str)
         kv = _parse_kv(tokens)
 
         name = kv.pop("name", None)
@@ -197,6 +244,10 @@ def main(
         bool,
         typer.Option("--verbose", "-v", help="Show LLM reasoning and tool calls"),
     ] = True,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Always run full discovery, ignoring cached servers"),
+    ] = False,
 ) -> None:
     """OneShotMCP: Dynamic MCP agent with automatic tool discovery.
 
@@ -247,20 +298,25 @@ def main(
             smithery_key=smithery_key,
             instructions=instructions or None,
             verbose=verbose,
+            discovery_cache=None if no_cache else DiscoveryCache(),
         )
 
         console.print(f"[bold cyan]OneShotMCP ready![/bold cyan] (model: {model})")
         console.print("[dim]Dynamic tool discovery enabled via Smithery registry.[/dim]")
         console.print("[dim]Type 'exit' to quit.[/dim]\n")
 
+        # Line editing/history for the prompt, if available on this platform
+        with contextlib.suppress(ImportError):
+            import readline  # noqa: F401
+
         while True:
             try:
-                user = input("> ").strip()
-            except (EOFError, KeyboardInterrupt):
+                user = (await _read_input("> ")).strip()
+            except (EOFError, KeyboardInterrupt, asyncio.CancelledError):
                 console.print("\nExiting.")
                 break
 
-            if user.lower() in {"exit", "quit"}:
+            if user.lower() in _EXIT_COMMANDS:
                 break
 
             if not user:
@@ -291,7 +347,11 @@ def main(
                     console.print(f"[dim]{traceback.format_exc()}[/dim]")
                 continue
 
-    asyncio.run(_chat())
+        await orchestrator.aclose()
+
+    # Ctrl+C while waiting for input cancels the chat task; exit quietly like EOF does
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_chat())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""Persistent cache of discovery outcomes.
+
+Remembers which Smithery server satisfied a capability, so a later session
+can try that server directly instead of repeating research, search and
+ranking. Only qualified names are stored; server specs (which may carry
+OAuth tokens or API keys) are always rebuilt from the registry.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR = Path.home() / ".cache" / "oneshotmcp"
+CACHE_FILE = CACHE_DIR / "discovery.json"
+
+# Entries older than this are ignored and rediscovered
+DEFAULT_TTL = 7 * 24 * 60 * 60.0
+
+
+class DiscoveryCache:
+    """JSON-backed map from capability to the Smithery server that provided it.
+
+    Cache format:
+    {
+        "github": {"qualified_name": "@smithery/github", "created_at": 1234567890.0}
+    }
+
+    The file is read once, on first use, and rewritten atomically on every
+    change. An unreadable or corrupt file is treated as empty.
+
+    Example:
+        >>> cache = DiscoveryCache()
+        >>> cache.set("github", "@smithery/github")
+        >>> cache.get("github")
+        '@smithery/github'
+    """
+
+    def __init__(self, cache_file: Path | None = None, ttl: float = DEFAULT_TTL) -> None:
+        self.cache_file = cache_file or CACHE_FILE
+        self.ttl = ttl
+        self._entries: dict[str, dict[str, Any]] | None = None
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Return cached entries, reading the cache file on first use."""
+        if self._entries is None:
+            try:
+                data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            self._entries = data if isinstance(data, dict) else {}
+        return self._entries
+
+    def _save(self) -> None:
+        """Write all entries to the cache file via a temp file and rename."""
+        entries = self._load()
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.cache_file.parent, prefix=f".{self.cache_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(entries, tmp)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def get(self, capability: str) -> str | None:
+        """Return the cached server for a capability, if present and fresh.
+
+        Args:
+            capability: Capability name (case-insensitive).
+
+        Returns:
+            Smithery qualified name, or None on a miss or expired entry.
+        """
+        entry = self._load().get(capability.lower())
+        if not isinstance(entry, dict):
+            return None
+
+        qualified_name = entry.get("qualified_name")
+        created_at = entry.get("created_at", 0)
+        if not isinstance(qualified_name, str) or not isinstance(created_at, (int, float)):
+            return None
+        if time.time() - created_at > self.ttl:
+            return None
+
+        return qualified_name
+
+    def set(self, capability: str, qualified_name: str) -> None:
+        """Record the server that provided a capability and persist the cache.
+
+        Args:
+            capability: Capability name (case-insensitive).
+            qualified_name: Smithery qualified name of the server.
+
+        Raises:
+            OSError: If the cache file cannot be written.
+        """
+        self._load()[capability.lower()] = {
+            "qualified_name": qualified_name,
+            "created_at": time.time(),
+        }
+        self._save()
+
+    def invalidate(self, capability: str) -> None:
+        """Forget the cached server for a capability, if any.
+
+        Args:
+            capability: Capability name (case-insensitive).
+
+        Raises:
+            OSError: If the cache file cannot be written.
+        """
+        if self._load().pop(capability.lower(), None) is not None:
+            self._save()
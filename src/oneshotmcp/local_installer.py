@@ -8,16 +8,43 @@ from __future__ import annotations
 
 import os
 import re
+import string
 import subprocess
 from typing import Any
 
 from .config import StdioServerSpec
 
+# Characters allowed in an npm scope or package name (case-insensitive)
+_NPM_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "-_.")
+
+# Shared fallback for config fields without a schema entry (read-only, never mutated)
+_EMPTY: dict[str, Any] = {}
+
+
+def _is_npm_name_part(part: str) -> bool:
+    """Return True if `part` is a non-empty npm scope or package name segment."""
+    return bool(part) and _NPM_NAME_CHARS.issuperset(part)
+
+
+def _unpack_requirements(
+    config_requirements: dict[str, Any],
+) -> tuple[list[str], dict[str, Any]]:
+    """Return the `(required, properties)` pair of a config requirements dict."""
+    return (
+        config_requirements.get("required", []),
+        config_requirements.get("properties") or _EMPTY,
+    )
+
 
 class LocalMCPInstaller:
-    """Handles local installation of MCP servers from npm packages."""
+    """Handles local installation of MCP servers from npm packages.
+
+    The installer holds no state, so a single instance can be reused for any
+    number of installation attempts.
+    """
 
-    def extract_npm_package(self, qualified_name: str) -> str:
+    @staticmethod
+    def extract_npm_package(qualified_name: str) -> str:
         """Extract npm package name from Smithery qualified name.
 
         Args:
@@ -28,7 +55,8 @@ class LocalMCPInstaller:
         """
         return qualified_name
 
-    def is_npm_installable(self, metadata: dict[str, Any]) -> bool:
+    @staticmethod
+    def is_npm_installable(metadata: dict[str, Any]) -> bool:
         """Check if Smithery server can be installed as npm package.
 
         Args:
@@ -43,10 +71,16 @@ class LocalMCPInstaller:
         # - Can be scoped (@scope/package) or unscoped (package)
         # - Only alphanumeric, hyphens, underscores, dots
         # - No spaces or special chars
-        npm_pattern = r"^(@[a-z0-9-_.]+\/)?[a-z0-9-_.]+$"
-        return bool(re.match(npm_pattern, qualified_name, re.IGNORECASE))
-
-    def extract_config_requirements(self, metadata: dict[str, Any]) -> dict[str, Any]:
+        if qualified_name.startswith("@"):
+            scope, sep, package = qualified_name[1:].partition("/")
+            if not sep or not _is_npm_name_part(scope):
+                return False
+        else:
+            package = qualified_name
+        return _is_npm_name_part(package)
+
+    @staticmethod
+    def extract_config_requirements(metadata: dict[str, Any]) -> dict[str, Any]:
         """Extract configuration requirements from Smithery metadata.
 
         Args:
@@ -65,8 +99,8 @@ class LocalMCPInstaller:
             "properties": config_schema.get("properties", {}),
         }
 
+    @staticmethod
     def build_npx_command(
-        self,
         package_name: str,
         config_requirements: dict[str, Any],
         user_config: dict[str, Any],
@@ -86,13 +120,12 @@ class LocalMCPInstaller:
         """
         cmd = ["npx", "-y", package_name]
 
-        required = config_requirements.get("required", [])
-        properties = config_requirements.get("properties", {})
+        required, properties = _unpack_requirements(config_requirements)
 
         for field in required:
             if field not in user_config:
                 # Check if env var is specified
-                field_props = properties.get(field, {})
+                field_props = properties.get(field) or _EMPTY
                 env_var = field_props.get("envVar")
 
                 if env_var and os.getenv(env_var):
@@ -130,10 +163,10 @@ class LocalMCPInstaller:
 
         # Extract env vars from config
         env_vars: dict[str, str] = {}
-        properties = config_requirements.get("properties", {})
+        _, properties = _unpack_requirements(config_requirements)
 
         for field, value in user_config.items():
-            field_props = properties.get(field, {})
+            field_props = properties.get(field) or _EMPTY
             env_var = field_props.get("envVar")
 
             if env_var:
@@ -146,7 +179,8 @@ class LocalMCPInstaller:
             keep_alive=True,
         )
 
-    async def is_npm_available(self) -> bool:
+    @staticmethod
+    async def is_npm_available() -> bool:
         """Check if npm/npx is available on system.
 
         Returns:
@@ -162,7 +196,8 @@ class LocalMCPInstaller:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
-    async def verify_package_exists(self, package_name: str) -> bool:
+    @staticmethod
+    async def verify_package_exists(package_name: str) -> bool:
         """Verify npm package exists in registry.
 
         Args:
@@ -181,7 +216,8 @@ class LocalMCPInstaller:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
-    async def verify_package_executable(self, package_name: str) -> tuple[bool, str]:
+    @staticmethod
+    async def verify_package_executable(package_name: str) -> tuple[bool, str]:
         """Verify npm package has executable entry.
 
         Checks if package has a 'bin' field in package.json, which indicates
@@ -281,8 +317,7 @@ class LocalMCPInstaller:
 
         # Extract config requirements
         config_requirements = self.extract_config_requirements(smithery_metadata)
-        required_fields = config_requirements.get("required", [])
-        properties = config_requirements.get("properties", {})
+        required_fields, properties = _unpack_requirements(config_requirements)
 
         # Auto-populate config from environment variables
         enriched_config = dict(user_config)
@@ -300,7 +335,7 @@ class LocalMCPInstaller:
             for field in required_fields:
                 if field not in enriched_config:
                     # Prompt user
-                    field_props = properties.get(field, {})
+                    field_props = properties.get(field) or _EMPTY
                     description = field_props.get("description", field)
                     env_var = field_props.get("envVar", "")
 
@@ -24,26 +24,122 @@ Example:
 from __future__ import annotations
 
 import asyncio
-import base64
+import contextlib
+import copy
 import hashlib
+import html
 import json
+import os
 import secrets
+import weakref
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http import HTTPStatus
 from pathlib import Path
 from typing import Any
-from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.parse import quote_plus, unquote_plus, urlparse
 
 import httpx
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from pydantic import BaseModel, Field
 
+try:  # SIMD-accelerated base64 if the optional `fast` extra is installed
+    from pybase64 import urlsafe_b64encode  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on installed extras
+    from base64 import urlsafe_b64encode
+
+try:  # Faster JSON for token storage if orjson is installed
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+
+    def _json_dumps(data: dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+
+    def _json_loads(raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+except ImportError:  # pragma: no cover - depends on installed extras
+
+    def _json_dumps(data: dict[str, Any]) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def _json_loads(raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
+
 # Constants
 PKCE_VERIFIER_LENGTH = 64  # Between 43-128 chars, using 64 for balance
 CALLBACK_PORT_RANGE = (8765, 8865)  # Try ports in this range
+CALLBACK_READ_TIMEOUT = 10.0  # Seconds to wait for a request on an open callback connection
 TOKEN_DIR = Path.home() / ".config" / "oneshotmcp"
 TOKEN_FILE = TOKEN_DIR / "tokens.json"
 
+# Token file format: version byte + 96-bit nonce + AES-GCM ciphertext and tag.
+# Files written before the switch are Fernet tokens (base64 text) and are
+# re-encrypted on first read.
+_TOKEN_FORMAT_AESGCM = b"\x81"
+_GCM_NONCE_SIZE = 12
+
+# Callback pages, encoded once (the error page takes an escaped description via %b)
+_SUCCESS_HTML = """
+<html>
+<body style="font-family: sans-serif; padding: 40px; text-align: center;">
+    <h1 style="color: #4caf50;">✓ Authorization Successful!</h1>
+    <p style="color: #666;">You can close this window and return to the terminal.</p>
+    <script>setTimeout(() => window.close(), 2000);</script>
+</body>
+</html>
+""".encode()
+_ERROR_HTML_TEMPLATE = """
+<html>
+<body style="font-family: sans-serif; padding: 40px; text-align: center;">
+    <h1 style="color: #d32f2f;">❌ Authorization Failed</h1>
+    <p style="color: #666;">%b</p>
+    <p style="color: #999; font-size: 14px;">You can close this window.</p>
+</body>
+</html>
+""".encode()
+_MISSING_CODE_HTML = """
+<html>
+<body style="font-family: sans-serif; padding: 40px; text-align: center;">
+    <h1 style="color: #d32f2f;">❌ Missing Authorization Code</h1>
+    <p style="color: #999; font-size: 14px;">You can close this window.</p>
+</body>
+</html>
+""".encode()
+
+# Callback HTTP response: status code, reason phrase, body length, body
+_RESPONSE_TEMPLATE = (
+    b"HTTP/1.1 %d %b\r\n"
+    b"Content-Type: text/html; charset=utf-8\r\n"
+    b"Content-Length: %d\r\n"
+    b"Connection: close\r\n"
+    b"\r\n"
+    b"%b"
+)
+
+# Token endpoint requests are form-encoded; httpx copies these into each request
+_FORM_HEADERS = httpx.Headers({"Content-Type": "application/x-www-form-urlencoded"})
+
+# Shared HTTP clients, one per event loop (httpx connection pools cannot cross loops)
+_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for the running event loop.
+
+    Reusing one client keeps pooled connections (and their TLS sessions) alive
+    across discovery, token exchange and token refresh requests.
+    """
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=10))
+        _http_clients[loop] = client
+    return client
+
 
 class OAuthError(Exception):
     """Raised when OAuth operations fail."""
@@ -180,6 +276,12 @@ class PKCEAuthenticator:
         self.client_id = client_id
         self.redirect_uri = redirect_uri
         self.scopes = scopes or []
+        # Fixed part of the authorization query; only the redirect URI,
+        # challenge and state vary per request.
+        self._static_params_prefix = (
+            f"response_type=code&client_id={quote_plus(client_id, safe='')}"
+            "&code_challenge_method=S256"
+        )
 
     @staticmethod
     def generate_pkce_pair() -> tuple[str, str]:
@@ -200,15 +302,15 @@ class PKCEAuthenticator:
         """
         # Generate cryptographically secure random verifier
         # Use URL-safe characters: [A-Z][a-z][0-9]-._~
-        verifier = base64.urlsafe_b64encode(secrets.token_bytes(48)).decode("utf-8")
-        verifier = verifier.rstrip("=")  # Remove padding
+        # 48 random bytes always give a 64-char unpadded base64url string.
+        verifier = secrets.token_urlsafe(48)
 
         # Calculate S256 challenge: BASE64URL(SHA256(verifier))
-        challenge_bytes = hashlib.sha256(verifier.encode("utf-8")).digest()
-        challenge = base64.urlsafe_b64encode(challenge_bytes).decode("utf-8")
-        challenge = challenge.rstrip("=")  # Remove padding
+        # hashlib is OpenSSL-backed, which selects SHA-NI/ARMv8 SHA kernels at runtime.
+        challenge_bytes = hashlib.sha256(verifier.encode("ascii")).digest()
+        challenge = urlsafe_b64encode(challenge_bytes).rstrip(b"=")  # Remove padding
 
-        return verifier, challenge
+        return verifier, challenge.decode("ascii")
 
     def build_authorization_url(
         self,
@@ -241,21 +343,19 @@ class PKCEAuthenticator:
             >>> "code_challenge=" in url
             True
         """
-        params = {
-            "response_type": "code",
-            "client_id": self.client_id,
-            "redirect_uri": redirect_uri,
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256",
-        }
+        # The challenge is base64url, so it never needs percent-encoding.
+        url = (
+            f"{self.authorization_endpoint}?{self._static_params_prefix}"
+            f"&redirect_uri={quote_plus(redirect_uri, safe='')}&code_challenge={code_challenge}"
+        )
 
         if self.scopes:
-            params["scope"] = " ".join(self.scopes)
+            url += f"&scope={quote_plus(' '.join(self.scopes), safe='')}"
 
         if state:
-            params["state"] = state
+            url += f"&state={quote_plus(state, safe='')}"
 
-        return f"{self.authorization_endpoint}?{urlencode(params)}"
+        return url
 
     async def exchange_code_for_token(
         self,
@@ -299,23 +399,24 @@ class PKCEAuthenticator:
             "code_verifier": code_verifier,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.token_endpoint,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                response.raise_for_status()
-                return response.json()
-
-            except httpx.HTTPStatusError as exc:
-                error_detail = exc.response.text
-                raise OAuthError(
-                    f"Token exchange failed ({exc.response.status_code}): {error_detail}"
-                ) from exc
-            except Exception as exc:
-                raise OAuthError(f"Token exchange failed: {exc}") from exc
+        client = _get_http_client()
+        try:
+            response = await client.post(
+                self.token_endpoint,
+                data=data,
+                headers=_FORM_HEADERS,
+            )
+            response.raise_for_status()
+            tokens: dict[str, Any] = response.json()
+            return tokens
+
+        except httpx.HTTPStatusError as exc:
+            error_detail = exc.response.text
+            raise OAuthError(
+                f"Token exchange failed ({exc.response.status_code}): {error_detail}"
+            ) from exc
+        except Exception as exc:
+            raise OAuthError(f"Token exchange failed: {exc}") from exc
 
     async def refresh_access_token(self, refresh_token: str) -> dict[str, Any]:
         """Refresh an expired access token using a refresh token.
@@ -344,23 +445,49 @@ class PKCEAuthenticator:
             "client_id": self.client_id,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.token_endpoint,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                response.raise_for_status()
-                return response.json()
+        client = _get_http_client()
+        try:
+            response = await client.post(
+                self.token_endpoint,
+                data=data,
+                headers=_FORM_HEADERS,
+            )
+            response.raise_for_status()
+            tokens: dict[str, Any] = response.json()
+            return tokens
+
+        except httpx.HTTPStatusError as exc:
+            error_detail = exc.response.text
+            raise OAuthError(
+                f"Token refresh failed ({exc.response.status_code}): {error_detail}"
+            ) from exc
+        except Exception as exc:
+            raise OAuthError(f"Token refresh failed: {exc}") from exc
 
-            except httpx.HTTPStatusError as exc:
-                error_detail = exc.response.text
-                raise OAuthError(
-                    f"Token refresh failed ({exc.response.status_code}): {error_detail}"
-                ) from exc
-            except Exception as exc:
-                raise OAuthError(f"Token refresh failed: {exc}") from exc
+
+_CALLBACK_PARAMS = frozenset({"code", "error", "error_description"})
+
+
+def _parse_callback_query(query: str) -> dict[str, str]:
+    """Extract the OAuth callback parameters from a query string.
+
+    Like `parse_qs`, the first occurrence of a key wins and blank values are
+    ignored, but only `code`, `error` and `error_description` are decoded.
+
+    Args:
+        query: Raw query string (without the leading "?").
+
+    Returns:
+        Dict of the callback parameters that were present.
+    """
+    params: dict[str, str] = {}
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if key in _CALLBACK_PARAMS and value and key not in params:
+            params[key] = unquote_plus(value)
+            if len(params) == len(_CALLBACK_PARAMS):
+                break
+    return params
 
 
 class BrowserAuthHandler:
@@ -370,7 +497,8 @@ class BrowserAuthHandler:
     Opens the user's browser to the authorization URL, then waits for the
     callback with the authorization code.
 
-    The server automatically shuts down after receiving the callback.
+    The server runs on the caller's event loop (no background thread) and
+    automatically shuts down after receiving the callback.
 
     Args:
         redirect_uri: Base callback URL (e.g., http://localhost:8765/callback).
@@ -388,89 +516,75 @@ class BrowserAuthHandler:
         self.timeout = timeout
         self._code: str | None = None
         self._error: str | None = None
-        self._server: HTTPServer | None = None
         self._received = asyncio.Event()
 
-    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
-        """Create HTTP handler class with access to instance state."""
-        # Need to close over self to access instance variables
-        handler_instance = self
-
-        class CallbackHandler(BaseHTTPRequestHandler):
-            """Handles OAuth callback requests."""
-
-            def do_GET(self) -> None:
-                """Handle GET request with authorization code."""
-                parsed = urlparse(self.path)
-
-                # Check if this is the callback path
-                if not parsed.path.endswith("/callback"):
-                    self.send_response(404)
-                    self.end_headers()
-                    return
-
-                # Parse query parameters
-                params = parse_qs(parsed.query)
-
-                # Check for error
-                if "error" in params:
-                    handler_instance._error = params["error"][0]
-                    error_desc = params.get("error_description", ["Unknown error"])[0]
-
-                    self.send_response(400)
-                    self.send_header("Content-Type", "text/html")
-                    self.end_headers()
-                    html = f"""
-                    <html>
-                    <body style="font-family: sans-serif; padding: 40px; text-align: center;">
-                        <h1 style="color: #d32f2f;">❌ Authorization Failed</h1>
-                        <p style="color: #666;">{error_desc}</p>
-                        <p style="color: #999; font-size: 14px;">You can close this window.</p>
-                    </body>
-                    </html>
-                    """
-                    self.wfile.write(html.encode("utf-8"))
-                    handler_instance._received.set()
-                    return
-
-                # Extract authorization code
-                if "code" in params:
-                    handler_instance._code = params["code"][0]
-
-                    self.send_response(200)
-                    self.send_header("Content-Type", "text/html")
-                    self.end_headers()
-                    html = """
-                    <html>
-                    <body style="font-family: sans-serif; padding: 40px; text-align: center;">
-                        <h1 style="color: #4caf50;">✓ Authorization Successful!</h1>
-                        <p style="color: #666;">You can close this window and return to the terminal.</p>
-                        <script>setTimeout(() => window.close(), 2000);</script>
-                    </body>
-                    </html>
-                    """
-                    self.wfile.write(html.encode("utf-8"))
-                    handler_instance._received.set()
-                else:
-                    self.send_response(400)
-                    self.send_header("Content-Type", "text/html")
-                    self.end_headers()
-                    html = """
-                    <html>
-                    <body style="font-family: sans-serif; padding: 40px; text-align: center;">
-                        <h1 style="color: #d32f2f;">❌ Missing Authorization Code</h1>
-                        <p style="color: #999; font-size: 14px;">You can close this window.</p>
-                    </body>
-                    </html>
-                    """
-                    self.wfile.write(html.encode("utf-8"))
-                    handler_instance._received.set()
-
-            def log_message(self, format: str, *args: Any) -> None:
-                """Suppress server logs."""
-                pass
-
-        return CallbackHandler
+    def _handle_callback(self, target: str) -> tuple[int, bytes]:
+        """Process a callback request target and record the outcome.
+
+        Args:
+            target: Request target from the HTTP request line (path + query).
+
+        Returns:
+            Tuple of (HTTP status code, HTML response body).
+        """
+        parsed = urlparse(target)
+
+        # Check if this is the callback path
+        if not parsed.path.endswith("/callback"):
+            return 404, b""
+
+        # Parse query parameters
+        params = _parse_callback_query(parsed.query)
+
+        # Check for error
+        if "error" in params:
+            self._error = params["error"]
+            error_desc = params.get("error_description", "Unknown error")
+            self._received.set()
+            return 400, _ERROR_HTML_TEMPLATE % html.escape(error_desc).encode("utf-8")
+
+        # Extract authorization code
+        if "code" in params:
+            self._code = params["code"]
+            self._received.set()
+            return 200, _SUCCESS_HTML
+
+        self._received.set()
+        return 400, _MISSING_CODE_HTML
+
+    @staticmethod
+    async def _read_request_line(reader: asyncio.StreamReader) -> bytes:
+        """Read the HTTP request line and skip the headers that follow it."""
+        request_line = await reader.readline()
+        while (await reader.readline()).strip():
+            pass
+        return request_line
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve a single HTTP/1.x request on the callback server."""
+        try:
+            request_line = await asyncio.wait_for(
+                self._read_request_line(reader), timeout=CALLBACK_READ_TIMEOUT
+            )
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET":
+                status, body = self._handle_callback(parts[1])
+            else:
+                status, body = 405, b""
+
+            # Format head and body into one buffer so the reply goes out in a
+            # single write instead of one concatenation (and copy) per header.
+            writer.write(
+                _RESPONSE_TEMPLATE
+                % (status, HTTPStatus(status).phrase.encode("ascii"), len(body), body)
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.TimeoutError):
+            pass  # Idle or dropped connection; keep waiting for a proper callback
+        finally:
+            writer.close()
 
     async def authorize(self, auth_url: str) -> str:
         """Open browser for authorization and wait for callback.
@@ -492,22 +606,12 @@ class BrowserAuthHandler:
         parsed = urlparse(self.redirect_uri)
         port = parsed.port or 80
 
-        # Start local HTTP server
+        # Start local HTTP server on this event loop
         try:
-            self._server = HTTPServer(("localhost", port), self._create_handler())
+            server = await asyncio.start_server(self._serve_connection, "localhost", port)
         except OSError as exc:
             raise OAuthError(f"Failed to start callback server on port {port}: {exc}") from exc
 
-        # Start server in background thread
-        def serve() -> None:
-            if self._server:
-                self._server.serve_forever()
-
-        import threading
-
-        server_thread = threading.Thread(target=serve, daemon=True)
-        server_thread.start()
-
         try:
             # Validate OAuth URL before opening browser
             is_valid, error = await validate_oauth_url(auth_url)
@@ -543,15 +647,38 @@ class BrowserAuthHandler:
 
         finally:
             # Shutdown server
-            if self._server:
-                self._server.shutdown()
+            server.close()
+
+
+_PRIVATE_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_private_file(path: Path, data: bytes) -> None:
+    """Write `data` to `path`, readable and writable by the owner only.
+
+    The file is created with mode 0600 rather than chmod-ed after writing,
+    so secrets are never briefly world-readable.
+
+    Args:
+        path: File to create or overwrite.
+        data: Bytes to write.
+    """
+    fd = os.open(path, _PRIVATE_FILE_FLAGS, 0o600)
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o600)  # O_CREAT's mode doesn't apply to existing files
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
 
 
 class TokenStore:
     """Secure storage for OAuth tokens with encryption.
 
     Stores tokens in an encrypted JSON file at ~/.config/oneshotmcp/tokens.json.
-    Uses Fernet symmetric encryption with a key derived from system information.
+    Uses AES-256-GCM encryption with a key stored alongside the token file.
 
     Token format per server:
     {
@@ -575,6 +702,12 @@ class TokenStore:
     def __init__(self, token_file: Path | None = None) -> None:
         self.token_file = token_file or TOKEN_FILE
         self._key: bytes | None = None
+        self._fernet: Fernet | None = None
+        self._aead: AESGCM | None = None
+
+        # Decrypted contents of token_file, valid while its (mtime_ns, size) is unchanged
+        self._cache: dict[str, Any] | None = None
+        self._cache_stamp: tuple[int, int] | None = None
 
     def _get_encryption_key(self) -> bytes:
         """Get or generate encryption key for token storage.
@@ -596,11 +729,40 @@ class TokenStore:
             # Generate new key
             self._key = Fernet.generate_key()
             key_file.parent.mkdir(parents=True, exist_ok=True)
-            key_file.write_bytes(self._key)
-            key_file.chmod(0o600)  # Owner read/write only
+            _write_private_file(key_file, self._key)
 
         return self._key
 
+    def _get_fernet(self) -> Fernet:
+        """Get the Fernet cipher for legacy token files, constructing it once.
+
+        Returns:
+            Fernet instance bound to the storage encryption key.
+        """
+        if self._fernet is None:
+            self._fernet = Fernet(self._get_encryption_key())
+        return self._fernet
+
+    def _get_aead(self) -> AESGCM:
+        """Get the AES-256-GCM cipher for token storage, constructing it once.
+
+        The key file keeps its Fernet format so existing installs stay
+        readable; the AES key is derived from it with HKDF so the two ciphers
+        never share key material directly.
+
+        Returns:
+            AESGCM instance bound to the derived storage key.
+        """
+        if self._aead is None:
+            hkdf = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=None,
+                info=b"oneshotmcp token store AES-256-GCM",
+            )
+            self._aead = AESGCM(hkdf.derive(self._get_encryption_key()))
+        return self._aead
+
     def _encrypt(self, data: dict[str, Any]) -> bytes:
         """Encrypt token data.
 
@@ -610,10 +772,9 @@ class TokenStore:
         Returns:
             Encrypted bytes.
         """
-        key = self._get_encryption_key()
-        fernet = Fernet(key)
-        json_bytes = json.dumps(data).encode("utf-8")
-        return fernet.encrypt(json_bytes)
+        nonce = os.urandom(_GCM_NONCE_SIZE)
+        ciphertext = self._get_aead().encrypt(nonce, _json_dumps(data), None)
+        return _TOKEN_FORMAT_AESGCM + nonce + ciphertext
 
     def _decrypt(self, encrypted: bytes) -> dict[str, Any]:
         """Decrypt token data.
@@ -628,10 +789,15 @@ class TokenStore:
             OAuthError: If decryption fails.
         """
         try:
-            key = self._get_encryption_key()
-            fernet = Fernet(key)
-            json_bytes = fernet.decrypt(encrypted)
-            return json.loads(json_bytes.decode("utf-8"))
+            if encrypted[:1] == _TOKEN_FORMAT_AESGCM:
+                nonce = encrypted[1 : 1 + _GCM_NONCE_SIZE]
+                plaintext = self._get_aead().decrypt(
+                    nonce, encrypted[1 + _GCM_NONCE_SIZE :], None
+                )
+            else:
+                plaintext = self._get_fernet().decrypt(encrypted)
+            data: dict[str, Any] = _json_loads(plaintext)
+            return data
         except Exception as exc:
             raise OAuthError(f"Failed to decrypt tokens: {exc}") from exc
 
@@ -647,23 +813,26 @@ class TokenStore:
             >>> tokens = {"access_token": "...", "refresh_token": "..."}
             >>> store.save_tokens("github", tokens)
         """
-        # Load existing tokens
-        all_tokens = self._load_all()
-
-        # Add created_at timestamp if not present
-        if "created_at" not in tokens:
+        # Existing tokens come from the decrypted-file cache when it is fresh
+        existing = self._load_all()
+
+        if "created_at" in tokens:
+            # Re-saving exactly what is stored (same created_at included): skip the write.
+            # The cache never shares dicts with callers, so this compares against the file.
+            if existing.get(server_name) == tokens:
+                return
+        else:
+            # Add created_at timestamp if not present
             import time
 
             tokens["created_at"] = int(time.time())
 
-        # Update with new tokens
+        # Update a copy so the cache stays intact if the write fails
+        all_tokens = dict(existing)
         all_tokens[server_name] = tokens
 
         # Encrypt and save
-        encrypted = self._encrypt(all_tokens)
-        self.token_file.parent.mkdir(parents=True, exist_ok=True)
-        self.token_file.write_bytes(encrypted)
-        self.token_file.chmod(0o600)  # Owner read/write only
+        self._write_all(all_tokens)
 
     def get_tokens(self, server_name: str) -> dict[str, Any] | None:
         """Retrieve tokens for a server.
@@ -680,8 +849,8 @@ class TokenStore:
             >>> if tokens:
             ...     print(tokens["access_token"])
         """
-        all_tokens = self._load_all()
-        return all_tokens.get(server_name)
+        # A copy, so callers can't change the cache behind the file's back
+        return copy.deepcopy(self._load_all().get(server_name))
 
     def delete_tokens(self, server_name: str) -> None:
         """Delete tokens for a server.
@@ -695,9 +864,8 @@ class TokenStore:
         """
         all_tokens = self._load_all()
         if server_name in all_tokens:
-            del all_tokens[server_name]
-            encrypted = self._encrypt(all_tokens)
-            self.token_file.write_bytes(encrypted)
+            remaining = {k: v for k, v in all_tokens.items() if k != server_name}
+            self._write_all(remaining)
 
     def list_servers(self) -> list[str]:
         """List all servers with stored tokens.
@@ -716,25 +884,72 @@ class TokenStore:
     def _load_all(self) -> dict[str, Any]:
         """Load all tokens from encrypted storage.
 
+        The decrypted dict is cached and only re-read when the file's
+        modification time or size changes, so repeated lookups skip decryption.
+
         Returns:
             Dict mapping server names to token dicts.
         """
-        if not self.token_file.exists():
+        stamp = self._file_stamp()
+        if stamp is None:
             return {}
 
+        if self._cache is not None and stamp == self._cache_stamp:
+            return self._cache
+
         try:
             encrypted = self.token_file.read_bytes()
-            return self._decrypt(encrypted)
+            all_tokens = self._decrypt(encrypted)
         except Exception:
             # If decryption fails (corrupt file, etc.), return empty dict
             return {}
 
+        if encrypted[:1] != _TOKEN_FORMAT_AESGCM:
+            # Legacy Fernet file: migrate it to the current format
+            with contextlib.suppress(OSError):
+                self._write_all(all_tokens)
+                return all_tokens
+
+        self._cache = all_tokens
+        self._cache_stamp = stamp
+        return all_tokens
+
+    def _write_all(self, all_tokens: dict[str, Any]) -> None:
+        """Encrypt and persist all tokens, then refresh the in-memory cache.
+
+        Args:
+            all_tokens: Dict mapping server names to token dicts.
+        """
+        encrypted = self._encrypt(all_tokens)
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        _write_private_file(self.token_file, encrypted)
+
+        # A copy, so later changes to the caller's dicts don't reach the cache
+        self._cache = copy.deepcopy(all_tokens)
+        self._cache_stamp = self._file_stamp()
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        """Return `(mtime_ns, size)` of the token file, or None if it doesn't exist."""
+        try:
+            st = self.token_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+
+# Discovered metadata per resource URL. Endpoints don't change during a run,
+# so each resource is only fetched once per process.
+_discovery_cache: dict[str, OAuthConfig] = {}
+_discovery_locks: dict[str, asyncio.Lock] = {}
+
 
 async def discover_oauth_metadata(resource_url: str) -> OAuthConfig:
     """Discover OAuth metadata via RFC 9728 Protected Resource Metadata.
 
     Fetches the .well-known/oauth-protected-resource endpoint to discover
-    the authorization server and token endpoints for a resource.
+    the authorization server and token endpoints for a resource. Successful
+    results are cached for the lifetime of the process, and concurrent
+    lookups of the same resource share a single request.
 
     Args:
         resource_url: The protected resource URL (MCP server URL).
@@ -750,50 +965,81 @@ async def discover_oauth_metadata(resource_url: str) -> OAuthConfig:
         >>> print(config.authorization_endpoint)
         https://example.com/oauth/authorize  # Discovered via RFC 8414/9728
     """
+    cached = _discovery_cache.get(resource_url)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
+    lock = _discovery_locks.setdefault(resource_url, asyncio.Lock())
+    try:
+        async with lock:
+            config = _discovery_cache.get(resource_url)
+            if config is None:
+                config = await _fetch_oauth_metadata(resource_url)
+                _discovery_cache[resource_url] = config
+    finally:
+        # Locks bind to the running loop, so don't keep them around once idle.
+        if not lock.locked() and _discovery_locks.get(resource_url) is lock:
+            del _discovery_locks[resource_url]
+
+    return config.model_copy(deep=True)
+
+
+async def _fetch_oauth_metadata(resource_url: str) -> OAuthConfig:
+    """Fetch OAuth metadata for a resource, bypassing the discovery cache."""
     # Parse resource URL to get base
     parsed = urlparse(resource_url)
     base_url = f"{parsed.scheme}://{parsed.netloc}"
 
-    # RFC 8414 Authorization Server Metadata (MCP specification)
-    # Try primary endpoint first
-    discovery_url = f"{base_url}/.well-known/oauth-authorization-server"
+    # RFC 8414 Authorization Server Metadata (MCP specification) is preferred,
+    # but the RFC 9728 fallback is requested concurrently so servers that only
+    # implement the latter don't cost an extra round trip.
+    client = _get_http_client()
+    primary = asyncio.ensure_future(
+        client.get(f"{base_url}/.well-known/oauth-authorization-server")
+    )
+    fallback = asyncio.ensure_future(
+        client.get(f"{base_url}/.well-known/oauth-protected-resource")
+    )
+    # Retrieve the fallback's outcome even when it goes unused, so a failed
+    # request isn't reported as a never-retrieved task exception.
+    fallback.add_done_callback(lambda task: task.cancelled() or task.exception())
 
-    async with httpx.AsyncClient() as client:
+    try:
+        response = await primary
+        response.raise_for_status()
+        metadata = response.json()
+
+        # Extract required fields from RFC 8414 format
+        return OAuthConfig(
+            authorization_endpoint=metadata["authorization_endpoint"],
+            token_endpoint=metadata["token_endpoint"],
+            resource=resource_url,  # RFC 8414 doesn't include resource
+            scopes=metadata.get("scopes_supported", []),
+            token_types_supported=metadata.get("token_types_supported", ["Bearer"]),
+        )
+
+    except httpx.HTTPStatusError:
+        # Fallback: RFC 9728 Protected Resource Metadata
         try:
-            response = await client.get(discovery_url)
+            response = await fallback
             response.raise_for_status()
             metadata = response.json()
 
-            # Extract required fields from RFC 8414 format
             return OAuthConfig(
                 authorization_endpoint=metadata["authorization_endpoint"],
                 token_endpoint=metadata["token_endpoint"],
-                resource=resource_url,  # RFC 8414 doesn't include resource
+                resource=metadata.get("resource", resource_url),
                 scopes=metadata.get("scopes_supported", []),
                 token_types_supported=metadata.get("token_types_supported", ["Bearer"]),
             )
-
-        except httpx.HTTPStatusError:
-            # Fallback: Try RFC 9728 Protected Resource Metadata
-            fallback_url = f"{base_url}/.well-known/oauth-protected-resource"
-            try:
-                response = await client.get(fallback_url)
-                response.raise_for_status()
-                metadata = response.json()
-
-                return OAuthConfig(
-                    authorization_endpoint=metadata["authorization_endpoint"],
-                    token_endpoint=metadata["token_endpoint"],
-                    resource=metadata.get("resource", resource_url),
-                    scopes=metadata.get("scopes_supported", []),
-                    token_types_supported=metadata.get("token_types_supported", ["Bearer"]),
-                )
-            except Exception as exc:
-                raise OAuthError(
-                    f"OAuth discovery failed at both RFC 8414 and RFC 9728 endpoints: {exc}"
-                ) from exc
-
-        except KeyError as exc:
-            raise OAuthError(f"Invalid OAuth metadata (missing {exc})") from exc
         except Exception as exc:
-            raise OAuthError(f"OAuth discovery failed: {exc}") from exc
+            raise OAuthError(
+                f"OAuth discovery failed at both RFC 8414 and RFC 9728 endpoints: {exc}"
+            ) from exc
+
+    except KeyError as exc:
+        raise OAuthError(f"Invalid OAuth metadata (missing {exc})") from exc
+    except Exception as exc:
+        raise OAuthError(f"OAuth discovery failed: {exc}") from exc
+    finally:
+        fallback.cancel()  # No-op once it has completed
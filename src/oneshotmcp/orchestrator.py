@@ -2,15 +2,261 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import heapq
 import re
-from typing import Any
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TypeGuard
 
 from .agent import ModelLike, build_deep_agent
 from .config import ServerSpec
+from .discovery_cache import DiscoveryCache
 from .oauth import TokenStore
-from .registry import OAuthRequired, SmitheryAPIClient
+from .registry import OAuthRequired, RegistryError, SmitheryAPIClient
 from .tools import MCPToolLoader
 
+if TYPE_CHECKING:
+    import httpx
+
+    from .local_installer import LocalMCPInstaller
+
+# Maximum number of Smithery searches in flight at once
+SEARCH_CONCURRENCY = 4
+
+# Unique search candidates kept for ranking; only the top few are ever tried
+MAX_SEARCH_CANDIDATES = 20
+
+# Number of top-ranked candidates tried before discovery gives up
+MAX_CANDIDATE_ATTEMPTS = 5
+
+# Number of top-ranked candidates whose metadata is fetched ahead of time
+METADATA_PREFETCH = 3
+
+# Number of capabilities whose research results are kept (least recently used evicted)
+RESEARCH_CACHE_SIZE = 64
+
+# Limits on the conversation history sent to the agent on each invocation; the
+# full history is still kept in DynamicOrchestrator.messages
+MAX_HISTORY_MESSAGES = 50
+MAX_HISTORY_TOKENS = 32_000
+_CHARS_PER_TOKEN = 4  # Rough estimate, avoids a tokenizer dependency
+
+# Number of agent replies kept when memoize_responses is enabled
+RESPONSE_CACHE_SIZE = 128
+
+# Reply-cache key: (role, content) of every message in the history window
+_MemoKey = tuple[tuple[Any, str], ...]
+
+# Phrases that indicate missing tools, fused into one alternation (any match counts).
+# "no ... tools ... available" is checked by _says_no_tools() instead.
+_NEEDS_TOOLS_RE = re.compile(
+    "|".join(
+        f"(?:{pattern})"
+        for pattern in (
+            r"i don'?t have (access to|tools for)",
+            r"i (cannot|can'?t) .* without",
+            r"i'?m unable to",
+            r"i don'?t have",
+            r"i cannot",
+        )
+    )
+)
+
+# Middle part of "no <...> server(s)/tool(s) <...> available/configured"
+_TOOL_NOUN_RE = re.compile(r"(?:server|tool)s? ")
+
+# Generic terms to filter out of research keywords (too common in tech).
+# These appear in many MCP descriptions but don't help differentiate servers.
+GENERIC_TERMS = frozenset(
+    {
+        # Infrastructure & architecture
+        "cloud",
+        "platform",
+        "server",
+        "service",
+        "tool",
+        "api",
+        "application",
+        "system",
+        "software",
+        "technology",
+        "solution",
+        "framework",
+        "library",
+        "package",
+        "module",
+        "integration",
+        "interface",
+        "protocol",
+        "infrastructure",
+        "services",
+        # Development roles & contexts
+        "frontend",
+        "backend",
+        "fullstack",
+        "developers",
+        "development",
+        "developer",
+        "apps",
+        "applications",
+        "websites",
+        "website",
+        # Deployment & hosting
+        "deployment",
+        "hosting",
+        "deploy",
+        "hosted",
+        "modern",
+        "quickly",
+        "fast",
+        "scalable",
+        # Generic verbs & adjectives
+        "primarily",
+        "focused",
+        "provides",
+        "enables",
+        "allows",
+        "helps",
+        "powerful",
+        "simple",
+        "easy",
+        "build",
+        "create",
+        "manage",
+        "using",
+        "with",
+    }
+)
+
+# Capability keywords, in priority order (earlier capabilities win when several match)
+_CAPABILITY_KEYWORDS = {
+    "github": ["github", "git hub", "repository", "repositories"],
+    "weather": ["weather", "forecast", "temperature", "climate"],
+    "database": ["database", "db", "sql", "query", "queries"],
+    "search": ["search", "google", "bing"],
+    "email": ["email", "mail", "smtp"],
+    "slack": ["slack", "messaging"],
+    "jira": ["jira", "ticket", "issue tracker"],
+    "calendar": ["calendar", "schedule", "appointment"],
+}
+_KEYWORD_TO_CAPABILITY = {
+    keyword: capability
+    for capability, keywords in _CAPABILITY_KEYWORDS.items()
+    for keyword in keywords
+}
+_CAPABILITY_PRIORITY = {capability: i for i, capability in enumerate(_CAPABILITY_KEYWORDS)}
+# One scan finds every keyword occurrence; the lookahead lets matches overlap
+# so a keyword is never hidden inside another one (e.g. "messagingithub").
+_CAPABILITY_KEYWORD_RE = re.compile(
+    "(?=("
+    + "|".join(sorted(map(re.escape, _KEYWORD_TO_CAPABILITY), key=len, reverse=True))
+    + "))"
+)
+
+# Aho-Corasick automaton over the same keywords: one linear pass instead of
+# trying every keyword at every position. Falls back to the regex without it.
+_CAPABILITY_AUTOMATON: Any = None
+try:  # Only if the optional `fast` extra is installed
+    import ahocorasick  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on installed extras
+    pass
+else:
+    _CAPABILITY_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _capability in _KEYWORD_TO_CAPABILITY.items():
+        _CAPABILITY_AUTOMATON.add_word(_keyword, _capability)
+    _CAPABILITY_AUTOMATON.make_automaton()
+    del _keyword, _capability
+
+# Literal substrings, at least one of which every _NEEDS_TOOLS_RE match contains.
+# Checking these first skips the regex for the usual, tool-free answer.
+_NEEDS_TOOLS_HINTS = ("don't have", "dont have", "cannot", "can't", "cant", "unable", "no ")
+
+# Reply used when no servers are configured yet; it always triggers discovery
+_NO_TOOLS_REPLY = "I don't have access to any tools yet to help with this request."
+
+# Explicit MCP request phrasings, tried in order (the first pattern that matches wins)
+_EXPLICIT_MCP_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"fetch\s+(\w+)\s+mcp",
+        r"use\s+(\w+)\s+mcp",
+        r"get\s+(\w+)\s+(?:server|mcp)",
+        r"add\s+(\w+)\s+(?:server|tools|mcp)",
+        r"install\s+(\w+)",
+        r"load\s+(\w+)\s+(?:server|mcp)",
+    )
+)
+
+
+def _iter_capability_mentions(text: str) -> Iterator[str]:
+    """Yield the capability of every keyword occurrence in lowercased `text`."""
+    if _CAPABILITY_AUTOMATON is not None:
+        for _end, capability in _CAPABILITY_AUTOMATON.iter(text):
+            yield capability
+    else:
+        for match in _CAPABILITY_KEYWORD_RE.finditer(text):
+            yield _KEYWORD_TO_CAPABILITY[match.group(1)]
+
+
+def _says_no_tools(text: str) -> bool:
+    """Return True if a line of `text` matches `no .*(server|tool)s? .*(available|configured)`.
+
+    As a regex, the two ``.*`` backtrack through every "no " in a line, which is
+    quadratic on long answers that say "no" a lot. Taking the first "no " and the
+    first tool noun after it finds a match whenever one exists, in linear time.
+    """
+    for line in text.split("\n"):
+        start = line.find("no ")
+        if start == -1:
+            continue
+        noun = _TOOL_NOUN_RE.search(line, start + 3)
+        if noun is not None and (
+            line.find("available", noun.end()) != -1 or line.find("configured", noun.end()) != -1
+        ):
+            return True
+    return False
+
+
+def _first_part_text(content: list[Any]) -> str | None:
+    """Return the text of the first content part, or None if it is not a dict.
+
+    A part without text (e.g. a tool call) is rendered whole instead.
+    """
+    if content and isinstance(content[0], dict):
+        text = content[0].get("text")
+        return text if isinstance(text, str) else str(content)
+    return None
+
+
+def _chunk_text(content: Any) -> str:
+    """Return the text carried by a streamed message chunk's content."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, str) or (isinstance(part, dict) and part.get("type") == "text")
+        )
+    return ""
+
+
+def _has_install_metadata(
+    server_info: dict[str, Any] | None,
+) -> TypeGuard[dict[str, Any]]:
+    """Return True if search results already carry what local installation reads."""
+    return server_info is not None and "connections" in server_info
+
+
+# Message content extractors keyed by exact content type (None means "not handled")
+_CONTENT_EXTRACTORS: dict[type, Callable[[Any], str | None]] = {
+    str: lambda content: content,
+    list: _first_part_text,
+}
+
 
 class DynamicOrchestrator:
     """Orchestrator that manages agent state and enables dynamic tool discovery.
@@ -29,6 +275,16 @@ class DynamicOrchestrator:
         initial_servers: Initial MCP servers to connect to.
         smithery_key: API key for Smithery registry.
         instructions: Optional system prompt override.
+        discovery_cache: Optional cache of servers found in earlier sessions;
+            a cached server is tried before running full discovery.
+        memoize_responses: Reuse the agent's reply when the same agent gets the
+            same history again. Only enable for deterministic models
+            (e.g. temperature=0).
+        overlap_discovery: On an explicit server request, let the current agent
+            answer while discovery runs. If discovery adds the server, that
+            run is cancelled and the rebuilt agent is asked again, so tool
+            calls it already made happen twice. Only enable when the current
+            tools are side-effect free.
 
     Example:
         >>> orchestrator = DynamicOrchestrator(
@@ -47,6 +303,9 @@ class DynamicOrchestrator:
         instructions: str | None = None,
         verbose: bool = False,
         token_store: TokenStore | None = None,
+        discovery_cache: DiscoveryCache | None = None,
+        memoize_responses: bool = False,
+        overlap_discovery: bool = False,
     ) -> None:
         self.model = model
         self.servers: dict[str, ServerSpec] = dict(initial_servers)
@@ -58,9 +317,109 @@ class DynamicOrchestrator:
         # External message storage (persists across rebuilds)
         self.messages: list[dict[str, Any]] = []
 
+        # Replies keyed by history window, with the graph that produced them
+        self.memoize_responses = memoize_responses
+        self.overlap_discovery = overlap_discovery
+        self._response_cache: OrderedDict[_MemoKey, tuple[Any, str]] = OrderedDict()
+
         # Agent components (replaced on rebuild)
         self.graph: Any = None
         self.loader: MCPToolLoader | None = None
+        # Servers the current graph was built with
+        self._built_servers: dict[str, ServerSpec] | None = None
+
+        # Stateless local installer, created on first fallback and reused afterwards
+        self._installer: LocalMCPInstaller | None = None
+
+        # Pooled client for Smithery metadata fetches, bound to the loop that created it
+        self._http: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+        self._smithery_headers = {"Authorization": f"Bearer {smithery_key}"}
+
+        # Servers found in earlier sessions (None disables the on-disk cache), and
+        # the Smithery server behind each capability added in this session
+        self.discovery_cache = discovery_cache
+        self._server_sources: dict[str, str] = {}
+
+        # Research results per lowercased capability; a repeat request skips
+        # building the research agent and the LLM round trips
+        self._research_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+        # Tavily-only research agent, reused while the Tavily spec is unchanged
+        self._research_graph: Any = None
+        self._research_spec: ServerSpec | None = None
+
+    def _history_window(self) -> list[dict[str, Any]]:
+        """Return the most recent messages that fit the history limits.
+
+        Walks back from the newest message, so the cost depends on the window
+        size rather than the session length. The window always includes the
+        newest message and never starts on an assistant reply.
+
+        Returns:
+            Messages to send to the agent, oldest first.
+        """
+        messages = self.messages
+        budget = MAX_HISTORY_TOKENS * _CHARS_PER_TOKEN
+        start = len(messages)
+
+        while start > 0 and len(messages) - start < MAX_HISTORY_MESSAGES:
+            budget -= len(messages[start - 1].get("content") or "")
+            if budget < 0 and start < len(messages):
+                break
+            start -= 1
+
+        while start < len(messages) - 1 and messages[start].get("role") != "user":
+            start += 1
+
+        return messages[start:]
+
+    def _memo_key(self) -> _MemoKey | None:
+        """Return the reply-cache key for the history window, or None without memoize_responses."""
+        if not self.memoize_responses:
+            return None
+        return tuple((m.get("role"), str(m.get("content"))) for m in self._history_window())
+
+    def _memoized_reply(self, key: _MemoKey | None, graph: Any) -> str | None:
+        """Return the reply `graph` already gave for the window `key`, if any."""
+        if key is None:
+            return None
+        cached = self._response_cache.get(key)
+        if cached is None or cached[0] is not graph:
+            return None
+        self._response_cache.move_to_end(key)
+        return cached[1]
+
+    def _memoize_reply(self, key: _MemoKey | None, graph: Any, text: str) -> None:
+        """Remember `graph`'s reply for the window `key` (no-op when `key` is None)."""
+        if key is None:
+            return
+        self._response_cache[key] = (graph, text)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    async def _invoke_agent(self, graph: Any) -> str:
+        """Run `graph` on the history window and return the reply text.
+
+        With memoize_responses, a window this graph has already answered
+        returns the earlier reply without invoking the agent.
+
+        Args:
+            graph: Agent graph to invoke.
+
+        Returns:
+            The agent's reply text.
+        """
+        key = self._memo_key()
+        cached = self._memoized_reply(key, graph)
+        if cached is not None:
+            return cached
+
+        result = await graph.ainvoke({"messages": self._history_window()})
+        text = self._extract_response_text(result)
+        self._memoize_reply(key, graph, text)
+        return text
 
     async def _rebuild_agent(self) -> None:
         """Rebuild the agent with current servers.
@@ -81,6 +440,8 @@ class DynamicOrchestrator:
             instructions=self.instructions,
             trace_tools=self.verbose,  # Enable tool tracing in verbose mode
         )
+        self._built_servers = dict(self.servers)
+        self._response_cache.clear()
 
         if self.verbose and self.loader:
             # Get detailed tool statistics
@@ -107,6 +468,52 @@ class DynamicOrchestrator:
                     f"(MAX_TOOLS_PER_SERVER={MAX_TOOLS_PER_SERVER})"
                 )
 
+    async def _refresh_agent(self) -> None:
+        """Rebuild the agent only if servers changed since the last build.
+
+        Discovery can "add" a server that is already configured (e.g. the
+        registry returns the cached spec for a repeated request), in which
+        case the current graph is still valid and the rebuild is skipped.
+        """
+        if self.graph is not None and self._built_servers == self.servers:
+            if self.verbose:
+                print("[BUILD] Servers unchanged, keeping current agent")
+            return
+
+        await self._rebuild_agent()
+
+    def _get_installer(self) -> LocalMCPInstaller:
+        """Return the shared local installer, creating it on first use."""
+        if self._installer is None:
+            from .local_installer import LocalMCPInstaller
+
+            self._installer = LocalMCPInstaller()
+        return self._installer
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use in this event loop.
+
+        Connections are reused across candidate attempts instead of paying a
+        TCP/TLS handshake per metadata fetch.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                timeout=30, limits=httpx.Limits(max_keepalive_connections=16)
+            )
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP clients, if any were created."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
+        await self.smithery.aclose()
+
     def _needs_tools(self, response: str) -> bool:
         """Detect if the agent response indicates missing tools.
 
@@ -125,21 +532,16 @@ class DynamicOrchestrator:
             >>> orchestrator._needs_tools("The result is 42")
             False
         """
-        # Patterns that indicate missing tools
-        patterns = [
-            r"i don'?t have (access to|tools for)",
-            r"i (cannot|can'?t) .* without",
-            r"i'?m unable to",
-            r"(there are )?no .*(server|tool)s? .*(available|configured)",
-            r"i don'?t have",
-            r"i cannot",
-        ]
-
         response_lower = response.lower()
+        if not any(hint in response_lower for hint in _NEEDS_TOOLS_HINTS):
+            return False
 
-        return any(re.search(pattern, response_lower) for pattern in patterns)
+        return (
+            _NEEDS_TOOLS_RE.search(response_lower) is not None
+            or _says_no_tools(response_lower)
+        )
 
-    def _extract_capability(self, response: str) -> str | None:
+    def _extract_capability(self, response: str, *, lowered: str | None = None) -> str | None:
         """Extract the capability name from agent response.
 
         Uses keyword matching to identify what capability is missing
@@ -147,6 +549,7 @@ class DynamicOrchestrator:
 
         Args:
             response: The agent's response text.
+            lowered: `response.lower()`, if the caller already computed it.
 
         Returns:
             Capability name (lowercase) or None if unclear.
@@ -155,27 +558,19 @@ class DynamicOrchestrator:
             >>> orchestrator._extract_capability("I need GitHub access")
             'github'
         """
-        response_lower = response.lower()
+        # Find the highest-priority capability mentioned anywhere in the response
+        best: str | None = None
+        best_priority = len(_CAPABILITY_PRIORITY)
 
-        # Common capability keywords
-        capabilities = {
-            "github": ["github", "git hub", "repository", "repositories"],
-            "weather": ["weather", "forecast", "temperature", "climate"],
-            "database": ["database", "db", "sql", "query", "queries"],
-            "search": ["search", "google", "bing"],
-            "email": ["email", "mail", "smtp"],
-            "slack": ["slack", "messaging"],
-            "jira": ["jira", "ticket", "issue tracker"],
-            "calendar": ["calendar", "schedule", "appointment"],
-        }
-
-        # Find the first matching capability
-        for capability, keywords in capabilities.items():
-            for keyword in keywords:
-                if keyword in response_lower:
-                    return capability
+        response_lower = response.lower() if lowered is None else lowered
+        for capability in _iter_capability_mentions(response_lower):
+            priority = _CAPABILITY_PRIORITY[capability]
+            if priority < best_priority:
+                best, best_priority = capability, priority
+                if priority == 0:
+                    break
 
-        return None
+        return best
 
     def _extract_response_text(self, result: dict[str, Any]) -> str:
         """Extract text response from agent invocation result.
@@ -186,18 +581,26 @@ class DynamicOrchestrator:
         Returns:
             Extracted text content or empty string.
         """
-        messages = result.get("messages", [])
-        if not messages:
-            return ""
+        messages = result.get("messages")
+        return self._extract_final_text(messages[-1] if messages else None)
+
+    @staticmethod
+    def _extract_final_text(final_message: Any) -> str:
+        """Extract the text of a single agent message.
 
-        final_message = messages[-1]
+        Args:
+            final_message: Last message of an agent result, or None.
+
+        Returns:
+            Message text, the message rendered as a string, or "" for no message.
+        """
         content = getattr(final_message, "content", None)
 
-        if isinstance(content, str):
-            return content
-        elif isinstance(content, list) and content:
-            if isinstance(content[0], dict):
-                return content[0].get("text", "")
+        extractor = _CONTENT_EXTRACTORS.get(type(content))
+        if extractor is not None:
+            text = extractor(content)
+            if text is not None:
+                return text
 
         return str(final_message) if final_message else ""
 
@@ -210,18 +613,19 @@ class DynamicOrchestrator:
         Returns:
             Deduplicated list preserving order.
         """
-        seen: set[str] = set()
-        unique: list[dict[str, Any]] = []
+        # Dicts keep insertion order, so one mapping does both the lookup and the ordering
+        unique: dict[str, dict[str, Any]] = {}
 
         for server in servers:
             qualified_name = server.get("qualifiedName") or server.get("qualified_name")
-            if qualified_name and qualified_name not in seen:
-                seen.add(qualified_name)
-                unique.append(server)
+            if qualified_name and qualified_name not in unique:
+                unique[qualified_name] = server
 
-        return unique
+        return list(unique.values())
 
-    def _extract_explicit_mcp_request(self, user_message: str) -> str | None:
+    def _extract_explicit_mcp_request(
+        self, user_message: str, *, lowered: str | None = None
+    ) -> str | None:
         """Extract explicit MCP server request from user message.
 
         Detects patterns where user explicitly requests a specific MCP server:
@@ -232,6 +636,7 @@ class DynamicOrchestrator:
 
         Args:
             user_message: The user's input message.
+            lowered: `user_message.lower()`, if the caller already computed it.
 
         Returns:
             Server name if explicit request detected, None otherwise.
@@ -242,20 +647,10 @@ class DynamicOrchestrator:
             >>> orchestrator._extract_explicit_mcp_request("what is the weather?")
             None
         """
-        message_lower = user_message.lower()
-
-        # Patterns for explicit MCP requests
-        patterns = [
-            r"fetch\s+(\w+)\s+mcp",
-            r"use\s+(\w+)\s+mcp",
-            r"get\s+(\w+)\s+(?:server|mcp)",
-            r"add\s+(\w+)\s+(?:server|tools|mcp)",
-            r"install\s+(\w+)",
-            r"load\s+(\w+)\s+(?:server|mcp)",
-        ]
+        message_lower = user_message.lower() if lowered is None else lowered
 
-        for pattern in patterns:
-            match = re.search(pattern, message_lower)
+        for pattern in _EXPLICIT_MCP_PATTERNS:
+            match = pattern.search(message_lower)
             if match:
                 return match.group(1)  # Return the server name
 
@@ -284,67 +679,6 @@ class DynamicOrchestrator:
             >>> keywords
             ['vercel', 'deployment', 'hosting', 'edge', 'serverless']
         """
-        # Generic terms to filter out (too common in tech)
-        # These terms appear in many MCP descriptions but don't help differentiate servers
-        GENERIC_TERMS = {
-            # Infrastructure & architecture
-            "cloud",
-            "platform",
-            "server",
-            "service",
-            "tool",
-            "api",
-            "application",
-            "system",
-            "software",
-            "technology",
-            "solution",
-            "framework",
-            "library",
-            "package",
-            "module",
-            "integration",
-            "interface",
-            "protocol",
-            "infrastructure",
-            "services",
-            # Development roles & contexts
-            "frontend",
-            "backend",
-            "fullstack",
-            "developers",
-            "development",
-            "developer",
-            "apps",
-            "applications",
-            "websites",
-            "website",
-            # Deployment & hosting
-            "deployment",
-            "hosting",
-            "deploy",
-            "hosted",
-            "modern",
-            "quickly",
-            "fast",
-            "scalable",
-            # Generic verbs & adjectives
-            "primarily",
-            "focused",
-            "provides",
-            "enables",
-            "allows",
-            "helps",
-            "powerful",
-            "simple",
-            "easy",
-            "build",
-            "create",
-            "manage",
-            "using",
-            "with",
-        }
-
         try:
             # Use LLM to extract specific keywords
             from langchain_core.messages import HumanMessage
@@ -394,18 +728,20 @@ Example for "github": github, repository, git, pull-request"""
             if self.verbose:
                 print(f"[RESEARCH] Keyword extraction failed, using fallback: {exc}")
 
-            # Simple fallback: extract words, filter generic terms
-            words = [
-                word.lower().strip(".,!?")
-                for word in description.split()
-                if len(word) > 4 and word.lower() not in GENERIC_TERMS
-            ]
+            # Simple fallback: extract words, filter generic terms. The
+            # description is lowercased once and scanning stops after 4 words.
+            capability_lower = capability.lower()
+            words = (
+                word.strip(".,!?")
+                for word in description.lower().split()
+                if len(word) > 4 and word not in GENERIC_TERMS
+            )
 
             # Always start with capability name
-            keywords = [capability.lower()]
-            keywords.extend([w for w in words if w != capability.lower()][:4])
+            keywords = [capability_lower]
+            keywords.extend(islice((w for w in words if w != capability_lower), 4))
 
-            return keywords[:5]
+            return keywords
 
     async def _research_capability(self, capability: str) -> dict[str, Any]:
         """Use web search to understand what the capability/tool is.
@@ -425,6 +761,14 @@ Example for "github": github, repository, git, pull-request"""
             >>> research["description"]
             'Context7 is a documentation search tool for libraries and frameworks'
         """
+        cache_key = capability.lower()
+        cached = self._research_cache.get(cache_key)
+        if cached is not None:
+            self._research_cache.move_to_end(cache_key)
+            if self.verbose:
+                print(f"[RESEARCH] Using cached research for '{capability}'")
+            return cached
+
         # Skip research if Tavily not available
         if "tavily" not in self.servers:
             if self.verbose:
@@ -435,17 +779,8 @@ Example for "github": github, repository, git, pull-request"""
             if self.verbose:
                 print(f"[RESEARCH] Researching '{capability}' using web search...")
 
-            # Build temporary mini-agent with just Tavily
-            from .agent import build_deep_agent
-
-            research_graph, _ = await build_deep_agent(
-                servers={"tavily": self.servers["tavily"]},
-                model=self.model,
-                instructions=f"You are a research assistant. Provide concise, factual answers about developer tools and MCP servers.",
-                trace_tools=False,  # Silent research
-            )
-
             # Ask research question
+            research_graph = await self._get_research_graph()
             result = await research_graph.ainvoke({
                 "messages": [{
                     "role": "user",
@@ -467,7 +802,11 @@ Example for "github": github, repository, git, pull-request"""
                     print(f"[RESEARCH] Found: {description[:80]}...")
                     print(f"[RESEARCH] Keywords: {keywords}")
 
-                return {"description": description, "keywords": keywords}
+                research = {"description": description, "keywords": keywords}
+                self._research_cache[cache_key] = research
+                if len(self._research_cache) > RESEARCH_CACHE_SIZE:
+                    self._research_cache.popitem(last=False)
+                return research
 
         except Exception as exc:
             if self.verbose:
@@ -475,6 +814,31 @@ Example for "github": github, repository, git, pull-request"""
 
         return {}
 
+    async def _get_research_graph(self) -> Any:
+        """Return the Tavily-only research agent, building it on first use.
+
+        The graph is rebuilt only when the configured Tavily server spec is
+        replaced, so each research call skips the MCP handshake and graph
+        compilation.
+
+        Returns:
+            Compiled research agent graph.
+        """
+        tavily_spec = self.servers["tavily"]
+        if self._research_graph is None or self._research_spec is not tavily_spec:
+            # Build mini-agent with just Tavily
+            from .agent import build_deep_agent
+
+            self._research_graph, _ = await build_deep_agent(
+                servers={"tavily": tavily_spec},
+                model=self.model,
+                instructions=f"You are a research assistant. Provide concise, factual answers about developer tools and MCP servers.",
+                trace_tools=False,  # Silent research
+            )
+            self._research_spec = tavily_spec
+
+        return self._research_graph
+
     def _generate_search_queries(
         self, capability: str, research: dict[str, Any]
     ) -> list[str]:
@@ -531,7 +895,8 @@ Example for "github": github, repository, git, pull-request"""
     ) -> list[dict[str, Any]]:
         """Execute multiple search queries and combine results.
 
-        Tries all query variations, collects results, and deduplicates.
+        Tries all query variations and collects deduplicated results, stopping
+        once MAX_SEARCH_CANDIDATES unique servers have been found.
 
         Args:
             queries: List of search query strings from _generate_search_queries().
@@ -546,30 +911,40 @@ Example for "github": github, repository, git, pull-request"""
             ...     "documentation search"
             ... ])
         """
-        all_results: list[dict[str, Any]] = []
-
-        for query in queries:
-            try:
-                if self.verbose:
-                    print(f"[SEARCH] Trying query: '{query}'...")
+        if self.verbose:
+            for query in dict.fromkeys(queries):
+                print(f"[SEARCH] Trying query: '{query}'...")
 
-                results = await self.smithery.search(query=query, limit=5)
+        # Queries are independent, so the registry runs them concurrently
+        outcomes = await self.smithery.bulk_search(
+            queries, limit=5, concurrency=SEARCH_CONCURRENCY
+        )
 
-                if results:
-                    if self.verbose:
-                        print(f"[SEARCH] Found {len(results)} result(s) for '{query}'")
-                    all_results.extend(results)
-                else:
-                    if self.verbose:
-                        print(f"[SEARCH] No results for '{query}'")
+        # Deduplicate while collecting, so duplicates across queries are never stored
+        seen: set[str] = set()
+        unique: list[dict[str, Any]] = []
 
-            except Exception as exc:
+        for query, results in outcomes.items():
+            if isinstance(results, RegistryError):
                 if self.verbose:
-                    print(f"[SEARCH] Error searching '{query}': {exc}")
+                    print(f"[SEARCH] Error searching '{query}': {results}")
                 continue
 
-        # Deduplicate combined results
-        unique = self._deduplicate_servers(all_results)
+            if results:
+                if self.verbose:
+                    print(f"[SEARCH] Found {len(results)} result(s) for '{query}'")
+                for server in results:
+                    qualified_name = server.get("qualifiedName") or server.get("qualified_name")
+                    if qualified_name and qualified_name not in seen:
+                        seen.add(qualified_name)
+                        unique.append(server)
+            else:
+                if self.verbose:
+                    print(f"[SEARCH] No results for '{query}'")
+
+            if len(unique) >= MAX_SEARCH_CANDIDATES:
+                del unique[MAX_SEARCH_CANDIDATES:]
+                break
 
         if self.verbose:
             print(f"[SEARCH] Total unique candidates: {len(unique)}")
@@ -581,6 +956,7 @@ Example for "github": github, repository, git, pull-request"""
         capability: str,
         servers: list[dict[str, Any]],
         research: dict[str, Any],
+        top_k: int | None = None,
     ) -> list[dict[str, Any]]:
         """Rank servers by relevance to the requested capability.
 
@@ -596,6 +972,7 @@ Example for "github": github, repository, git, pull-request"""
             capability: Requested capability (e.g., "context7").
             servers: List of server candidates from search.
             research: Research results with keywords.
+            top_k: Keep only the best ``top_k`` servers (None keeps all of them).
 
         Returns:
             Servers sorted by relevance score (highest first), with score=0 servers removed.
@@ -608,15 +985,28 @@ Example for "github": github, repository, git, pull-request"""
             ... )
         """
 
+        # Everything derived from the capability and research is computed once,
+        # not per server
+        capability_lower = capability.lower()
+        scoped_prefix = f"@{capability_lower}/"
+        smithery_name = f"@smithery/{capability_lower}"
+
+        # Keyword overlap excludes the capability name itself to avoid inflated scores
+        keywords_lower: list[str] = []
+        if research and research.get("keywords"):
+            keywords_lower = [
+                kw_lower
+                for kw_lower in (kw.lower() for kw in research["keywords"])
+                if kw_lower != capability_lower
+            ]
+
         def calculate_score(server: dict[str, Any]) -> int:
+            # Fields are lowercased only when an earlier tier didn't already match
             qualified_name = (server.get("qualifiedName") or "").lower()
-            name = (server.get("name") or "").lower()
-            description = (server.get("description") or "").lower()
-            capability_lower = capability.lower()
 
             # Direct pattern match (HIGHEST priority - follows MCP naming conventions)
             # @{capability}/* or @smithery/{capability}
-            if qualified_name.startswith(f"@{capability_lower}/") or qualified_name == f"@smithery/{capability_lower}":
+            if qualified_name.startswith(scoped_prefix) or qualified_name == smithery_name:
                 return 120
 
             # Exact match in qualified name (high priority)
@@ -624,47 +1014,49 @@ Example for "github": github, repository, git, pull-request"""
                 return 100
 
             # Match in server name
-            if capability_lower in name:
+            if capability_lower in (server.get("name") or "").lower():
                 return 80
 
             # Match in description
+            description = (server.get("description") or "").lower()
             if capability_lower in description:
                 return 60
 
             # Keyword overlap from research (REDUCED scoring, more conservative)
-            # Excludes capability name itself to avoid inflated scores
-            if research and research.get("keywords"):
-                keywords = research["keywords"]
-                # Filter out the capability name from keyword matching
-                filtered_keywords = [kw for kw in keywords if kw.lower() != capability_lower]
-
-                if filtered_keywords:
-                    matches = sum(1 for kw in filtered_keywords if kw.lower() in description)
-                    if matches > 0:
-                        # Much lower base score: 10 + 3 per match, max 20
-                        # This prevents fuzzy matches from ranking above exact matches
-                        return min(10 + (matches * 3), 20)
+            if keywords_lower:
+                matches = sum(1 for kw in keywords_lower if kw in description)
+                if matches > 0:
+                    # Much lower base score: 10 + 3 per match, max 20
+                    # This prevents fuzzy matches from ranking above exact matches
+                    return min(10 + (matches * 3), 20)
 
             return 0
 
-        # Score and sort
+        def by_score(item: tuple[dict[str, Any], int]) -> int:
+            return item[1]
+
         scored = [(s, calculate_score(s)) for s in servers]
-        ranked = sorted(scored, key=lambda x: x[1], reverse=True)
 
         # Filter out servers with score=0 (no relevance)
         # This prevents attempting completely unrelated servers from fuzzy search
-        relevant = [(s, score) for s, score in ranked if score > 0]
+        relevant = [(s, score) for s, score in scored if score > 0]
+
+        # Both orderings are stable, so equal scores keep their search order
+        if top_k is None:
+            ranked = sorted(relevant, key=by_score, reverse=True)
+        else:
+            ranked = heapq.nlargest(top_k, relevant, key=by_score)
 
         if self.verbose:
-            print(f"[RANKING] Ranked {len(ranked)} candidates ({len(relevant)} relevant):")
-            for server, score in ranked[:5]:  # Show top 5
+            print(f"[RANKING] Ranked {len(scored)} candidates ({len(relevant)} relevant):")
+            for server, score in heapq.nlargest(5, scored, key=by_score):  # Show top 5
                 qn = server.get("qualifiedName", "unknown")
                 desc = server.get("description", "")[:40]
                 relevance = "✓" if score > 0 else "✗"
                 print(f"[RANKING]   {relevance} {score:3d} pts: {qn} - {desc}...")
 
         # Return only relevant servers (score > 0)
-        return [s for s, _ in relevant]
+        return [s for s, _ in ranked]
 
     async def _handle_oauth_flow(self, oauth_exc: OAuthRequired, capability: str) -> bool:
         """Handle OAuth authentication flow automatically.
@@ -685,8 +1077,10 @@ Example for "github": github, repository, git, pull-request"""
             print(f"\n🔐 Server '{oauth_exc.server_name}' requires OAuth 2.1 authentication")
             print(f"This will open your browser to authorize OneShotMCP.")
 
-            # Prompt user for consent
-            user_input = input("\nOpen browser for authorization? (yes/no): ").strip().lower()
+            # Prompt user for consent (in a worker thread, so the event loop keeps running)
+            user_input = (
+                await asyncio.to_thread(input, "\nOpen browser for authorization? (yes/no): ")
+            ).strip().lower()
 
             # Check if user accepts (accept variations: yes, y, YES, Y)
             if user_input not in ("yes", "y"):
@@ -744,8 +1138,32 @@ Example for "github": github, repository, git, pull-request"""
                 print(f"[OAUTH] ✗ OAuth flow failed: {exc}")
             return False
 
+    async def _fetch_local_metadata(self, qualified_name: str) -> dict[str, Any]:
+        """Fetch full Smithery metadata for a server (needed for config requirements).
+
+        Args:
+            qualified_name: Smithery qualified name (e.g., "@upstash/context7-mcp")
+
+        Returns:
+            Server metadata dict from the Smithery API.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        encoded_name = qualified_name.replace("/", "%2F").replace("@", "%40")
+        url = f"{self.smithery._base_url}/servers/{encoded_name}"
+
+        response = await self._get_http_client().get(url, headers=self._smithery_headers)
+        response.raise_for_status()
+        metadata: dict[str, Any] = response.json()
+        return metadata
+
     async def _try_local_installation(
-        self, qualified_name: str, capability: str
+        self,
+        qualified_name: str,
+        capability: str,
+        metadata_fetch: Awaitable[dict[str, Any]] | None = None,
+        search_info: dict[str, Any] | None = None,
     ) -> bool:
         """Attempt local installation of MCP server when hosted version fails.
 
@@ -759,33 +1177,28 @@ Example for "github": github, repository, git, pull-request"""
         Args:
             qualified_name: Smithery qualified name (e.g., "@upstash/context7-mcp")
             capability: Capability name for server naming
+            metadata_fetch: Metadata request already in flight for this server,
+                if it was prefetched; otherwise metadata is fetched here.
+            search_info: Server info from the search results. Used as the metadata
+                without another request when it already includes "connections".
 
         Returns:
             True if local installation succeeded, False otherwise
         """
-        from .local_installer import LocalMCPInstaller
-
         try:
             # Fetch full Smithery metadata (need it for config requirements)
             if self.verbose:
                 print(f"[LOCAL] Fetching metadata for local installation...")
 
-            # Get metadata from Smithery API directly
-            import httpx
-
-            encoded_name = qualified_name.replace("/", "%2F").replace("@", "%40")
-            url = f"{self.smithery._base_url}/servers/{encoded_name}"
-            headers = {"Authorization": f"Bearer {self.smithery._api_key}"}
-
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                metadata = response.json()
+            if metadata_fetch is not None:
+                metadata = await metadata_fetch
+            elif _has_install_metadata(search_info):
+                metadata = search_info
+            else:
+                metadata = await self._fetch_local_metadata(qualified_name)
 
             # Attempt local installation
-            installer = LocalMCPInstaller()
-
-            spec = await installer.attempt_local_installation(
+            spec = await self._get_installer().attempt_local_installation(
                 smithery_metadata=metadata,
                 user_config={},  # TODO: Allow user to provide config
             )
@@ -835,10 +1248,52 @@ Example for "github": github, repository, git, pull-request"""
                 print(f"[ATTEMPT] No candidates to try")
             return False
 
-        # Try top 5 candidates (or all if fewer)
-        max_attempts = min(5, len(ranked_servers))
+        # Try the top candidates (or all if fewer)
+        max_attempts = min(MAX_CANDIDATE_ATTEMPTS, len(ranked_servers))
+
+        # Start metadata fetches for the best few candidates up front, so later
+        # attempts find their metadata already downloaded. Candidates are still
+        # tried in ranked order.
+        prefetched: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        for server_info in ranked_servers[:max_attempts]:
+            if len(prefetched) == METADATA_PREFETCH:
+                break
+            if _has_install_metadata(server_info):
+                continue
+            name = server_info.get("qualifiedName") or server_info.get("qualified_name")
+            if name and name not in prefetched:
+                task = asyncio.ensure_future(self._fetch_local_metadata(name))
+                # Unused fetches may fail after we've moved on; retrieve their errors
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                prefetched[name] = task
 
-        for i, server_info in enumerate(ranked_servers[:max_attempts], 1):
+        try:
+            return await self._try_ranked_candidates(
+                ranked_servers[:max_attempts], capability, prefetched
+            )
+        finally:
+            for pending in prefetched.values():
+                pending.cancel()
+
+    async def _try_ranked_candidates(
+        self,
+        candidates: list[dict[str, Any]],
+        capability: str,
+        prefetched: dict[str, asyncio.Future[dict[str, Any]]],
+    ) -> bool:
+        """Try each candidate in order: local npm install first, then hosted.
+
+        Args:
+            candidates: Servers to try, best match first.
+            capability: Capability name for server naming.
+            prefetched: In-flight metadata fetches keyed by qualified name.
+
+        Returns:
+            True if a server was successfully added, False otherwise.
+        """
+        max_attempts = len(candidates)
+
+        for i, server_info in enumerate(candidates, 1):
             qualified_name = server_info.get("qualifiedName") or server_info.get(
                 "qualified_name"
             )
@@ -858,23 +1313,46 @@ Example for "github": github, repository, git, pull-request"""
                 if self.verbose:
                     print(f"[ATTEMPT] Trying local npm installation first...")
 
+                # The metadata document is the same one get_server() reads, so
+                # one fetch serves both the local and the hosted attempt
+                metadata_fetch = prefetched.get(qualified_name)
+                if metadata_fetch is None and not _has_install_metadata(server_info):
+                    metadata_fetch = asyncio.ensure_future(
+                        self._fetch_local_metadata(qualified_name)
+                    )
+                    metadata_fetch.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    prefetched[qualified_name] = metadata_fetch
+
                 local_success = await self._try_local_installation(
                     qualified_name=qualified_name,
                     capability=capability,
+                    metadata_fetch=metadata_fetch,
+                    search_info=server_info,
                 )
                 if local_success:
+                    self._server_sources[capability] = qualified_name
                     return True
 
                 # PRIORITY 2: Local installation failed, try Smithery-hosted with OAuth
                 if self.verbose:
                     print(f"[ATTEMPT] Local installation failed, trying hosted server...")
 
+                hosted_metadata = server_info if _has_install_metadata(server_info) else None
+                if (
+                    metadata_fetch is not None
+                    and metadata_fetch.done()
+                    and not metadata_fetch.cancelled()
+                    and metadata_fetch.exception() is None
+                ):
+                    hosted_metadata = metadata_fetch.result()
+
                 try:
                     # Get full server spec from Smithery (may require OAuth)
-                    spec = await self.smithery.get_server(qualified_name)
+                    spec = await self.smithery.get_server(qualified_name, metadata=hosted_metadata)
 
                     # Add to active servers
                     self.servers[capability] = spec
+                    self._server_sources[capability] = qualified_name
 
                     if self.verbose:
                         print(
@@ -891,6 +1369,7 @@ Example for "github": github, repository, git, pull-request"""
                     # Try OAuth flow
                     oauth_success = await self._handle_oauth_flow(oauth_exc, capability)
                     if oauth_success:
+                        self._server_sources[capability] = qualified_name
                         return True
 
                     # OAuth failed
@@ -899,8 +1378,6 @@ Example for "github": github, repository, git, pull-request"""
 
                 except Exception as exc:
                     # Check if it's a RegistryError (config requirement, etc.)
-                    from .registry import RegistryError
-
                     if isinstance(exc, RegistryError):
                         if self.verbose:
                             print(f"[ATTEMPT] Cannot use hosted server: {exc}")
@@ -926,7 +1403,10 @@ Example for "github": github, repository, git, pull-request"""
         return False
 
     def _suggest_alternatives(
-        self, capability: str, ranked_servers: list[dict[str, Any]]
+        self,
+        capability: str,
+        ranked_servers: list[dict[str, Any]],
+        total_found: int | None = None,
     ) -> None:
         """Suggest alternatives to the user when all attempts fail.
 
@@ -936,6 +1416,8 @@ Example for "github": github, repository, git, pull-request"""
         Args:
             capability: The requested capability.
             ranked_servers: Servers that were attempted (ranked by relevance).
+            total_found: Number of candidates search returned, if more than
+                were attempted (defaults to `len(ranked_servers)`).
 
         Example:
             >>> orchestrator._suggest_alternatives("context7", [
@@ -950,8 +1432,10 @@ Example for "github": github, repository, git, pull-request"""
             print(f"   • Check spelling or try alternative names")
             return
 
+        if total_found is None:
+            total_found = len(ranked_servers)
         print(
-            f"\n⚠️  Discovery failed: Found {len(ranked_servers)} potential matches, but all require OAuth or manual config"
+            f"\n⚠️  Discovery failed: Found {total_found} potential matches, but all require OAuth or manual config"
         )
         print(f"\n🔍 Top candidates found:")
 
@@ -1004,25 +1488,28 @@ Example for "github": github, repository, git, pull-request"""
             f"@smithery/{capability}",  # Official Smithery package
         ]
 
-        for pattern in direct_patterns:
-            try:
-                if self.verbose:
-                    print(f"[SEARCH] Trying direct pattern: '{pattern}'...")
-
-                results = await self.smithery.search(query=pattern, limit=5)
+        if self.verbose:
+            for pattern in direct_patterns:
+                print(f"[SEARCH] Trying direct pattern: '{pattern}'...")
 
-                if results:
-                    if self.verbose:
-                        print(
-                            f"[SEARCH] ✓ Found {len(results)} result(s) with pattern '{pattern}'"
-                        )
-                    all_results.extend(results)
+        # Patterns are independent, so the registry runs them concurrently
+        pattern_outcomes = await self.smithery.bulk_search(
+            direct_patterns, limit=5, concurrency=SEARCH_CONCURRENCY
+        )
 
-            except Exception as exc:
+        for pattern, results in pattern_outcomes.items():
+            if isinstance(results, RegistryError):
                 if self.verbose:
-                    print(f"[SEARCH] Error with pattern '{pattern}': {exc}")
+                    print(f"[SEARCH] Error with pattern '{pattern}': {results}")
                 continue
 
+            if results:
+                if self.verbose:
+                    print(
+                        f"[SEARCH] ✓ Found {len(results)} result(s) with pattern '{pattern}'"
+                    )
+                all_results.extend(results)
+
         # Phase 2: Fall back to multi-query text search
         # (Only if direct patterns found nothing or few results)
         if len(all_results) < 3:
@@ -1039,23 +1526,25 @@ Example for "github": github, repository, git, pull-request"""
                 f"{capability} server",  # With server suffix
             ]
 
-            for query in queries:
-                try:
-                    if self.verbose:
-                        print(f"[SEARCH] Trying text query: '{query}'...")
-
-                    results = await self.smithery.search(query=query, limit=5)
+            if self.verbose:
+                for query in queries:
+                    print(f"[SEARCH] Trying text query: '{query}'...")
 
-                    if results:
-                        if self.verbose:
-                            print(f"[SEARCH] Found {len(results)} result(s) for '{query}'")
-                        all_results.extend(results)
+            query_outcomes = await self.smithery.bulk_search(
+                queries, limit=5, concurrency=SEARCH_CONCURRENCY
+            )
 
-                except Exception as exc:
+            for query, results in query_outcomes.items():
+                if isinstance(results, RegistryError):
                     if self.verbose:
-                        print(f"[SEARCH] Error searching '{query}': {exc}")
+                        print(f"[SEARCH] Error searching '{query}': {results}")
                     continue
 
+                if results:
+                    if self.verbose:
+                        print(f"[SEARCH] Found {len(results)} result(s) for '{query}'")
+                    all_results.extend(results)
+
         # Deduplicate combined results
         unique = self._deduplicate_servers(all_results)
 
@@ -1064,10 +1553,42 @@ Example for "github": github, repository, git, pull-request"""
 
         return unique
 
+    async def _try_cached_server(self, capability: str) -> bool:
+        """Try the server the discovery cache recorded for a capability.
+
+        A server that no longer works is dropped from the cache so the full
+        discovery runs instead.
+
+        Args:
+            capability: Capability name to look up.
+
+        Returns:
+            True if the cached server was added, False on a miss or failure.
+        """
+        if self.discovery_cache is None:
+            return False
+
+        qualified_name = self.discovery_cache.get(capability)
+        if qualified_name is None:
+            return False
+
+        if self.verbose:
+            print(f"[DISCOVERY] Trying cached server '{qualified_name}' for '{capability}'...")
+
+        if await self._try_candidates([{"qualifiedName": qualified_name}], capability):
+            return True
+
+        if self.verbose:
+            print("[DISCOVERY] Cached server failed, running full discovery")
+        with contextlib.suppress(OSError):
+            self.discovery_cache.invalidate(capability)
+        return False
+
     async def _discover_and_add_server(self, capability: str) -> bool:
         """Intelligent multi-phase MCP server discovery.
 
         This method orchestrates a 5-phase discovery process:
+        0. Cache: Retry the server that provided this capability before, if cached
         1. Research: Use web search to understand the capability
         2. Enhanced Search: Direct pattern matching + multi-query fallback
         3. Ranking: Score candidates by relevance
@@ -1088,6 +1609,10 @@ Example for "github": github, repository, git, pull-request"""
         if self.verbose:
             print(f"\n[DISCOVERY] Starting intelligent discovery for '{capability}'...")
 
+        # Phase 0: Retry the server that provided this capability last time
+        if await self._try_cached_server(capability):
+            return True
+
         # Phase 1: Research the capability (if Tavily available)
         research = await self._research_capability(capability)
 
@@ -1101,7 +1626,9 @@ Example for "github": github, repository, git, pull-request"""
             return False
 
         # Phase 3: Rank candidates by relevance
-        ranked = self._rank_servers(capability, candidates, research)
+        ranked = self._rank_servers(
+            capability, candidates, research, top_k=MAX_CANDIDATE_ATTEMPTS
+        )
 
         # Phase 4: Try adding candidates in ranked order
         success = await self._try_candidates(ranked, capability)
@@ -1109,18 +1636,88 @@ Example for "github": github, repository, git, pull-request"""
         if success:
             if self.verbose:
                 print(f"[DISCOVERY] ✓ Successfully discovered and added '{capability}'")
+            if self.discovery_cache is not None and capability in self._server_sources:
+                # The cache only saves work; failing to persist it is harmless
+                with contextlib.suppress(OSError):
+                    self.discovery_cache.set(capability, self._server_sources[capability])
             return True
 
         # Phase 5: All attempts failed - suggest alternatives
-        self._suggest_alternatives(capability, ranked)
+        # Only the top candidates were attempted, but report everything found
+        self._suggest_alternatives(capability, ranked, total_found=len(candidates))
         return False
 
+    async def _discover_and_refresh(self, capability: str) -> bool:
+        """Discover a server for `capability` and rebuild the agent if one was added.
+
+        Args:
+            capability: Capability to discover (e.g., "github").
+
+        Returns:
+            True if a server was added and the agent refreshed, False otherwise.
+        """
+        if not await self._discover_and_add_server(capability):
+            return False
+        await self._refresh_agent()
+        return True
+
+    async def _start_turn(self, user_message: str) -> tuple[str, asyncio.Future[str] | None]:
+        """Record the user message and handle an explicit server request.
+
+        Shared by chat() and chat_stream(). With overlap_discovery, an existing
+        agent starts answering while the requested server is discovered; that
+        answer is handed back only if the agent ends up unchanged (e.g.
+        discovery fails), otherwise it is cancelled.
+
+        Args:
+            user_message: The user's message/query.
+
+        Returns:
+            `(user_message.lower(), speculative answer or None)`.
+        """
+        self.messages.append({"role": "user", "content": user_message})
+        # Both explicit-request and capability detection read the lowercased message
+        user_lower = user_message.lower()
+
+        explicit_server = self._extract_explicit_mcp_request(user_message, lowered=user_lower)
+        if not explicit_server:
+            return user_lower, None
+
+        if self.verbose:
+            print(f"[DISCOVERY] Detected explicit request for '{explicit_server}' MCP server")
+
+        speculative: asyncio.Future[str] | None = None
+        speculative_graph = self.graph
+        if self.overlap_discovery and speculative_graph is not None:
+            speculative = asyncio.ensure_future(self._invoke_agent(speculative_graph))
+
+        try:
+            added = await self._discover_and_refresh(explicit_server)
+        except BaseException:
+            if speculative is not None:
+                speculative.cancel()
+            raise
+
+        if not added and self.verbose:
+            print(f"[DISCOVERY] Could not add '{explicit_server}' server")
+
+        if speculative is not None and self.graph is not speculative_graph:
+            speculative.cancel()
+            speculative = None
+
+        return user_lower, speculative
+
     async def chat(self, user_message: str) -> str:
         """Main conversation loop with dynamic tool discovery.
 
         Sends a message to the agent, detects if tools are missing,
         dynamically discovers and adds them, then retries.
 
+        With overlap_discovery, an explicit server request is answered by the
+        current agent while discovery runs. When discovery adds the server,
+        that answer is discarded and the question asked again, repeating any
+        tool calls the first run made.
+
         Args:
             user_message: The user's message/query.
 
@@ -1134,87 +1731,148 @@ Example for "github": github, repository, git, pull-request"""
             >>> response = await orchestrator.chat("Search GitHub for MCP servers")
             >>> print(response)
         """
-        # Add user message to history
-        self.messages.append({"role": "user", "content": user_message})
+        user_lower, speculative = await self._start_turn(user_message)
 
-        # Check for explicit MCP server request (proactive discovery)
-        explicit_server = self._extract_explicit_mcp_request(user_message)
-        if explicit_server:
-            if self.verbose:
-                print(f"[DISCOVERY] Detected explicit request for '{explicit_server}' MCP server")
+        if not self.servers:
+            # Cold start: there is no agent to ask, and the answer is known to
+            # need tools, so go straight to discovery
+            final_text = _NO_TOOLS_REPLY
+            needs_tools = True
+        else:
+            if speculative is not None:
+                final_text = await speculative
+            else:
+                # Build agent if not already built
+                if self.graph is None:
+                    await self._rebuild_agent()
 
-            # Proactively discover and add the server
-            success = await self._discover_and_add_server(explicit_server)
+                # Invoke agent with recent message history
+                final_text = await self._invoke_agent(self.graph)
 
-            if success:
-                # Rebuild agent with new server
-                await self._rebuild_agent()
-            else:
-                if self.verbose:
-                    print(f"[DISCOVERY] Could not add '{explicit_server}' server")
+            # Check if agent needs tools
+            needs_tools = self._needs_tools(final_text)
 
-        # If no servers yet, create a synthetic "no tools" response to trigger discovery
-        if not self.servers:
-            final_text = "I don't have access to any tools yet to help with this request."
-        else:
-            # Build agent if not already built
-            if self.graph is None:
-                await self._rebuild_agent()
-
-            # Invoke agent with full message history
-            result = await self.graph.ainvoke({"messages": self.messages})
-
-            # Extract final response
-            final_message = result.get("messages", [])[-1] if result.get("messages") else None
-            final_text = ""
-
-            if final_message:
-                content = getattr(final_message, "content", None)
-                if isinstance(content, str):
-                    final_text = content
-                elif isinstance(content, list) and content and isinstance(content[0], dict):
-                    final_text = content[0].get("text", str(content))
-                else:
-                    final_text = str(final_message)
+        if needs_tools:
+            # Extract what capability is needed from the user's message
+            capability = self._extract_capability(user_message, lowered=user_lower)
+
+            if capability and await self._discover_and_refresh(capability):
+                # Retry the original query; the failed response never
+                # entered history, so the agent doesn't see it
+                final_text = await self._invoke_agent(self.graph)
 
         # Add assistant response to history
         self.messages.append({"role": "assistant", "content": final_text})
 
-        # Check if agent needs tools
-        if self._needs_tools(final_text):
-            # Extract what capability is needed from the user's message
-            capability = self._extract_capability(user_message)
+        return final_text
 
-            if capability:
-                # Try to discover and add the server
-                success = await self._discover_and_add_server(capability)
+    async def _stream_agent(self, graph: Any) -> AsyncIterator[tuple[Any, str]]:
+        """Stream `graph` on the history window.
 
-                if success:
-                    # Rebuild agent with new server
-                    await self._rebuild_agent()
+        Args:
+            graph: Agent graph to stream.
 
-                    # Retry the original query (remove the failed response first)
-                    self.messages.pop()  # Remove failed assistant response
+        Yields:
+            `(message_id, text)` for each piece of assistant text, as the
+            model generates it. Tool calls and tool results are skipped.
+        """
+        async for chunk, _metadata in graph.astream(
+            {"messages": self._history_window()}, stream_mode="messages"
+        ):
+            if getattr(chunk, "type", None) not in ("AIMessageChunk", "ai"):
+                continue
+            text = _chunk_text(getattr(chunk, "content", None))
+            if text:
+                yield getattr(chunk, "id", None), text
 
-                    # Invoke again with updated tools
-                    result = await self.graph.ainvoke({"messages": self.messages})
+    async def _stream_reply(self, parts: list[str]) -> AsyncIterator[str]:
+        """Stream the current agent's reply, collecting the final message's text.
 
-                    # Extract final response again
-                    final_message = (
-                        result.get("messages", [])[-1] if result.get("messages") else None
-                    )
-                    final_text = ""
+        With memoize_responses, a window this graph has already answered
+        yields the earlier reply in one piece.
+
+        Args:
+            parts: Filled with the text pieces of the last assistant message
+                (earlier messages are intermediate steps, e.g. before a tool call).
 
-                    if final_message:
-                        content = getattr(final_message, "content", None)
-                        if isinstance(content, str):
-                            final_text = content
-                        elif isinstance(content, list) and content and isinstance(content[0], dict):
-                            final_text = content[0].get("text", str(content))
-                        else:
-                            final_text = str(final_message)
+        Yields:
+            Every piece of assistant text, as it arrives.
+        """
+        graph = self.graph
+        key = self._memo_key()
+        cached = self._memoized_reply(key, graph)
+        if cached is not None:
+            parts[:] = [cached]
+            yield cached
+            return
 
-                    # Update history with successful response
-                    self.messages.append({"role": "assistant", "content": final_text})
+        current_id: Any = object()
+        async for message_id, text in self._stream_agent(graph):
+            if message_id != current_id:
+                current_id = message_id
+                parts.clear()
+            parts.append(text)
+            yield text
 
-        return final_text
+        self._memoize_reply(key, graph, "".join(parts))
+
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """Streaming variant of chat(): yields reply text as the agent generates it.
+
+        Discovery, overlap_discovery and memoize_responses work as in chat().
+        When the user's message names a capability, a missing-tools reply
+        could be replaced by a retry after discovery, so the first reply is
+        held back until it has been checked; only the reply that ends up in
+        history is ever yielded. Other replies stream as they are generated.
+        On a cold start, discovery runs before anything is yielded.
+
+        Args:
+            user_message: The user's message/query.
+
+        Yields:
+            Pieces of the agent's reply text.
+
+        Example:
+            >>> async for text in orchestrator.chat_stream("Search GitHub for MCP servers"):
+            ...     print(text, end="", flush=True)
+        """
+        user_lower, speculative = await self._start_turn(user_message)
+        capability = self._extract_capability(user_message, lowered=user_lower)
+
+        if not self.servers:
+            # Cold start: discover before showing anything, as chat() does
+            if capability is None or not await self._discover_and_refresh(capability):
+                yield _NO_TOOLS_REPLY
+                self.messages.append({"role": "assistant", "content": _NO_TOOLS_REPLY})
+                return
+        elif speculative is not None or capability is not None:
+            if speculative is not None:
+                final_text = await speculative
+                held = [final_text]
+            else:
+                if self.graph is None:
+                    await self._rebuild_agent()
+                parts: list[str] = []
+                held = [text async for text in self._stream_reply(parts)]
+                final_text = "".join(parts)
+
+            # Missing tools are only detectable once the whole reply is in
+            retry = (
+                capability is not None
+                and self._needs_tools(final_text)
+                and await self._discover_and_refresh(capability)
+            )
+            if not retry:
+                for text in held:
+                    yield text
+                self.messages.append({"role": "assistant", "content": final_text})
+                return
+            # The held-back reply is dropped; the retry below streams live
+
+        if self.graph is None:
+            await self._rebuild_agent()
+
+        parts = []
+        async for text in self._stream_reply(parts):
+            yield text
+        self.messages.append({"role": "assistant", "content": "".join(parts)})
@@ -72,6 +72,32 @@ class SmitheryAPIClient:
         self._search_cache: dict[str, list[dict[str, Any]]] = {}
         self._server_cache: dict[str, HTTPServerSpec] = {}
 
+        # Pooled HTTP client, bound to the event loop that created it
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use in this event loop.
+
+        Keep-alive connections let concurrent searches and follow-up server
+        lookups share TLS sessions instead of handshaking per request.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
     async def _retry_with_backoff(
         self,
         operation: str,
@@ -150,15 +176,14 @@ class SmitheryAPIClient:
         params = {"q": query, "pageSize": limit}
 
         async def _do_search() -> list[dict[str, Any]]:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, params=params, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                # API returns either a list directly or a dict with "servers" key
-                if isinstance(data, list):
-                    return data
-                servers: list[dict[str, Any]] = data.get("servers", [])
-                return servers
+            response = await self._get_client().get(url, params=params, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+            # API returns either a list directly or a dict with "servers" key
+            if isinstance(data, list):
+                return data
+            servers: list[dict[str, Any]] = data.get("servers", [])
+            return servers
 
         try:
             servers: list[dict[str, Any]] = await self._retry_with_backoff(
@@ -178,11 +203,59 @@ class SmitheryAPIClient:
         except Exception as exc:
             raise RegistryError(f"Failed to search for '{query}': {exc}") from exc
 
-    async def get_server(self, qualified_name: str) -> HTTPServerSpec:
+    async def bulk_search(
+        self, queries: list[str], limit: int = 5, concurrency: int = 4
+    ) -> dict[str, list[dict[str, Any]] | RegistryError]:
+        """Run several searches concurrently.
+
+        Smithery has no multi-query endpoint, so this fans out to `search()`
+        with at most `concurrency` requests in flight. Repeated queries are
+        only searched once, and cached queries don't hit the network.
+
+        Args:
+            queries: Search queries, in order of preference.
+            limit: Maximum number of results per query (default: 5).
+            concurrency: Maximum number of concurrent requests (default: 4).
+
+        Returns:
+            Dict mapping each distinct query (in input order) to its results,
+            or to the RegistryError raised for that query.
+
+        Example:
+            >>> results = await client.bulk_search(["github", "git repository"])
+            >>> for query, servers in results.items():
+            ...     print(query, servers)
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _search_one(query: str) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self.search(query=query, limit=limit)
+
+        outcomes = await asyncio.gather(
+            *(_search_one(query) for query in unique_queries), return_exceptions=True
+        )
+
+        results: dict[str, list[dict[str, Any]] | RegistryError] = {}
+        for query, outcome in zip(unique_queries, outcomes, strict=True):
+            if isinstance(outcome, RegistryError) or not isinstance(outcome, BaseException):
+                results[query] = outcome
+            elif isinstance(outcome, Exception):
+                results[query] = RegistryError(f"Failed to search for '{query}': {outcome}")
+            else:
+                raise outcome
+        return results
+
+    async def get_server(
+        self, qualified_name: str, metadata: dict[str, Any] | None = None
+    ) -> HTTPServerSpec:
         """Retrieve server metadata and return as HTTPServerSpec.
 
         Args:
             qualified_name: Full server identifier (e.g., "@smithery/github").
+            metadata: Server metadata already fetched from `/servers/{name}`, if
+                the caller has it; skips fetching it again.
 
         Returns:
             HTTPServerSpec configured for the server.
@@ -205,17 +278,19 @@ class SmitheryAPIClient:
         headers = {"Authorization": f"Bearer {self._api_key}"}
 
         async def _do_get_server() -> dict[str, Any]:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data: dict[str, Any] = response.json()
-                return data
+            response = await self._get_client().get(url, headers=headers)
+            response.raise_for_status()
+            data: dict[str, Any] = response.json()
+            return data
 
         try:
-            data = await self._retry_with_backoff(
-                operation=f"Get server '{qualified_name}'",
-                func=_do_get_server,
-            )
+            if metadata is not None:
+                data = metadata
+            else:
+                data = await self._retry_with_backoff(
+                    operation=f"Get server '{qualified_name}'",
+                    func=_do_get_server,
+                )
 
             # Extract connection information from the connections array
             connections = data.get("connections", [])
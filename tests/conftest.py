@@ -0,0 +1,96 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from oneshotmcp import oauth
+from oneshotmcp.registry import OAuthRequired
+from tests.fixtures.token_store import MemoryTokenStore
+
+if TYPE_CHECKING:
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+# Model every orchestrator_factory instance starts from
+_TEST_MODEL = "openai:gpt-4.1-nano"
+
+
+@pytest.fixture(autouse=True)
+def _clear_oauth_discovery_cache() -> Iterator[None]:
+    """Keep discovered OAuth metadata from leaking between tests."""
+    oauth._discovery_cache.clear()
+    yield
+    oauth._discovery_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def mcp_config_validator() -> Callable[[dict[str, Any]], Any]:
+    """FastMCP's MCPConfig.from_dict, with its schema built once per session."""
+    from fastmcp.mcp_config import MCPConfig
+
+    MCPConfig.from_dict({"mcpServers": {}})
+    return MCPConfig.from_dict
+
+
+@pytest.fixture
+def memory_token_store() -> MemoryTokenStore:
+    """Empty in-memory token store."""
+    return MemoryTokenStore()
+
+
+@pytest.fixture(scope="module")
+def orchestrator_factory() -> Callable[..., DynamicOrchestrator]:
+    """Return a builder that reuses one DynamicOrchestrator per set of options.
+
+    Orchestrators are cached for the module, keyed by their keyword arguments
+    (on top of a test model, no initial servers and a test Smithery key).
+    A reused instance is reset to its freshly built state: test model,
+    no servers, agent, research agent or history, and empty caches.
+    """
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    cache: dict[tuple[tuple[str, Any], ...], DynamicOrchestrator] = {}
+
+    def make(**kwargs: Any) -> DynamicOrchestrator:
+        key = tuple(sorted(kwargs.items()))
+        orchestrator = cache.get(key)
+        if orchestrator is None:
+            orchestrator = cache[key] = DynamicOrchestrator(
+                model=_TEST_MODEL,
+                initial_servers={},
+                smithery_key="test-key",
+                **kwargs,
+            )
+        orchestrator.model = _TEST_MODEL
+        orchestrator.servers.clear()
+        orchestrator.graph = None
+        orchestrator.loader = None
+        orchestrator._built_servers = None
+        orchestrator._server_sources.clear()
+        orchestrator.messages.clear()
+        orchestrator._response_cache.clear()
+        orchestrator._research_cache.clear()
+        orchestrator._research_graph = None
+        orchestrator._research_spec = None
+        return orchestrator
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def context7_oauth_exc() -> OAuthRequired:
+    """OAuthRequired for the hosted Context7 server, built once per module."""
+    return OAuthRequired(
+        message="OAuth required",
+        server_name="@upstash/context7-mcp",
+        oauth_config=oauth.OAuthConfig.model_construct(
+            authorization_endpoint="https://oauth.smithery.ai/authorize",
+            token_endpoint="https://oauth.smithery.ai/token",
+            resource="https://server.smithery.ai/context7/mcp",
+            scopes=["read", "write"],
+        ),
+        auth_url="https://oauth.smithery.ai/authorize?client_id=oneshotmcp-cli",
+    )
@@ -7,8 +7,23 @@ OAuth integration without requiring real authorization servers.
 from __future__ import annotations
 
 import hashlib
+import hmac
 import base64
-from typing import Any
+from collections import OrderedDict
+from typing import Any, TypeVar
+
+_V = TypeVar("_V")
+
+# Oldest codes and tokens are evicted beyond this many per store
+MAX_STORED_ENTRIES = 1024
+
+
+def _put(store: OrderedDict[str, _V], key: str, value: _V, cap: int = MAX_STORED_ENTRIES) -> None:
+    """Insert into a bounded store, evicting the oldest entry when full."""
+    store[key] = value
+    store.move_to_end(key)
+    if len(store) > cap:
+        store.popitem(last=False)
 
 
 class MockOAuthServer:
@@ -33,10 +48,10 @@ class MockOAuthServer:
         self.base_url = base_url
         self.resource_url = resource_url
 
-        # Storage for codes and tokens
-        self._authorization_codes: dict[str, dict[str, Any]] = {}
-        self._access_tokens: dict[str, dict[str, Any]] = {}
-        self._refresh_tokens: dict[str, str] = {}  # refresh_token -> access_token
+        # Storage for codes and tokens, bounded so long test sessions don't grow them forever
+        self._authorization_codes: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._access_tokens: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._refresh_tokens: OrderedDict[str, str] = OrderedDict()  # refresh_token -> access_token
 
     def get_protected_resource_metadata(self) -> dict[str, Any]:
         """Return RFC 9728 Protected Resource Metadata.
@@ -94,12 +109,16 @@ class MockOAuthServer:
         code = secrets.token_urlsafe(32)
 
         # Store code with metadata
-        self._authorization_codes[code] = {
-            "client_id": client_id,
-            "redirect_uri": redirect_uri,
-            "code_challenge": code_challenge,
-            "code_challenge_method": code_challenge_method,
-        }
+        _put(
+            self._authorization_codes,
+            code,
+            {
+                "client_id": client_id,
+                "redirect_uri": redirect_uri,
+                "code_challenge": code_challenge,
+                "code_challenge_method": code_challenge_method,
+            },
+        )
 
         return code
 
@@ -138,12 +157,11 @@ class MockOAuthServer:
             >>> "access_token" in tokens
             True
         """
-        # Validate code exists
-        if code not in self._authorization_codes:
+        # Validate code exists (it is only consumed once the exchange succeeds)
+        code_data = self._authorization_codes.get(code)
+        if code_data is None:
             raise ValueError("invalid_grant: Invalid authorization code")
 
-        code_data = self._authorization_codes[code]
-
         # Validate client_id and redirect_uri
         if code_data["client_id"] != client_id:
             raise ValueError("invalid_client: Client ID mismatch")
@@ -155,7 +173,7 @@ class MockOAuthServer:
         expected_challenge = code_data["code_challenge"]
         actual_challenge = self._calculate_pkce_challenge(code_verifier)
 
-        if actual_challenge != expected_challenge:
+        if not hmac.compare_digest(actual_challenge, expected_challenge):
             raise ValueError("invalid_grant: Code verifier validation failed")
 
         # Generate tokens
@@ -165,14 +183,11 @@ class MockOAuthServer:
         refresh_token = f"refresh_{secrets.token_urlsafe(32)}"
 
         # Store tokens
-        self._access_tokens[access_token] = {
-            "client_id": client_id,
-            "scopes": ["read", "write"],
-        }
-        self._refresh_tokens[refresh_token] = access_token
+        _put(self._access_tokens, access_token, {"client_id": client_id, "scopes": ["read", "write"]})
+        _put(self._refresh_tokens, refresh_token, access_token)
 
         # Delete used authorization code
-        del self._authorization_codes[code]
+        self._authorization_codes.pop(code, None)
 
         return {
             "access_token": access_token,
@@ -201,15 +216,14 @@ class MockOAuthServer:
             >>> "access_token" in new_tokens
             True
         """
-        if refresh_token not in self._refresh_tokens:
+        # Delete old refresh token (OAuth 2.1: refresh tokens are single-use)
+        old_access_token = self._refresh_tokens.pop(refresh_token, None)
+        if old_access_token is None:
             raise ValueError("invalid_grant: Invalid refresh token")
 
         # Invalidate old access token
-        old_access_token = self._refresh_tokens[refresh_token]
-        if old_access_token in self._access_tokens:
-            client_data = self._access_tokens[old_access_token]
-            del self._access_tokens[old_access_token]
-        else:
+        client_data = self._access_tokens.pop(old_access_token, None)
+        if client_data is None:
             client_data = {"client_id": "test-client", "scopes": ["read", "write"]}
 
         # Generate new tokens (OAuth 2.1: rotate refresh tokens)
@@ -219,11 +233,8 @@ class MockOAuthServer:
         new_refresh_token = f"refresh_{secrets.token_urlsafe(32)}"
 
         # Store new tokens
-        self._access_tokens[new_access_token] = client_data
-        self._refresh_tokens[new_refresh_token] = new_access_token
-
-        # Delete old refresh token
-        del self._refresh_tokens[refresh_token]
+        _put(self._access_tokens, new_access_token, client_data)
+        _put(self._refresh_tokens, new_refresh_token, new_access_token)
 
         return {
             "access_token": new_access_token,
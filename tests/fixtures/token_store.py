@@ -0,0 +1,36 @@
+"""In-memory token store for testing.
+
+Lets OAuth flow tests check which tokens were saved without encrypting and
+writing a token file.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from oneshotmcp.oauth import TokenStore
+
+
+class MemoryTokenStore(TokenStore):
+    """TokenStore that keeps tokens in a dict instead of an encrypted file.
+
+    For tests that only check what the orchestrator saved; persistence itself
+    is covered by TestTokenStore in test_oauth.py.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tokens: dict[str, dict[str, Any]] = {}
+
+    def save_tokens(self, server_name: str, tokens: dict[str, Any]) -> None:
+        self._tokens[server_name] = tokens
+
+    def get_tokens(self, server_name: str) -> dict[str, Any] | None:
+        return self._tokens.get(server_name)
+
+    def delete_tokens(self, server_name: str) -> None:
+        self._tokens.pop(server_name, None)
+
+    def list_servers(self) -> list[str]:
+        return list(self._tokens)
+
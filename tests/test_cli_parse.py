@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from oneshotmcp.cli import _merge_servers, _parse_kv
+from oneshotmcp.cli import _merge_servers, _parse_kv, _split_block
 
 
 def test_parse_kv_simple() -> None:
     assert _parse_kv(["a=1", "b = two"]) == {"a": "1", "b": "two"}
 
 
+def test_split_block_quotes_and_hashes() -> None:
+    assert _split_block("name=x args='-m mod' header.X=a#b") == [
+        "name=x",
+        "args=-m mod",
+        "header.X=a#b",
+    ]
+
+
 def test_merge_servers_http_and_stdio() -> None:
     stdios = [
         "name=echo command=python args='-m mypkg.server --port 3333' env.API_KEY=xyz keep_alive=false",
@@ -8,113 +8,76 @@ Bug fix: /Users/duy/Documents/build/DeepMCPAgent/src/oneshotmcp/config.py
 - To: Conditionally include env only if it has values
 """
 
+from collections.abc import Callable
+from typing import Any
+
 import pytest
-from fastmcp.mcp_config import MCPConfig
 
 from oneshotmcp.config import StdioServerSpec, servers_to_mcp_config
 
-
-def test_empty_env_dict_conversion():
-    """Test that empty env dict is handled correctly (not converted to None)."""
-    spec = StdioServerSpec(
-        command="npx",
-        args=["-y", "@cloudflare/playwright-mcp"],
-        env={},  # Empty dict - this was causing the bug
-        keep_alive=True,
-    )
-
-    servers = {"test": spec}
-    config = servers_to_mcp_config(servers)
-
-    # env should be omitted entirely, not set to None
-    assert "env" not in config["test"], "Empty env dict should be omitted from config"
-    assert config["test"]["command"] == "npx"
-    assert config["test"]["args"] == ["-y", "@cloudflare/playwright-mcp"]
-    assert config["test"]["keep_alive"] is True
-
-    # Verify FastMCP validation passes
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
-
-
-def test_populated_env_dict_conversion():
-    """Test that env dict with values is included correctly."""
-    spec = StdioServerSpec(
-        command="npx",
-        args=["-y", "some-package"],
-        env={"API_KEY": "secret123", "DEBUG": "true"},
-        keep_alive=True,
-    )
-
-    servers = {"test": spec}
-    config = servers_to_mcp_config(servers)
-
-    # env should be included with values
-    assert "env" in config["test"]
-    assert config["test"]["env"] == {"API_KEY": "secret123", "DEBUG": "true"}
-
-    # Verify FastMCP validation passes
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
-
-
-def test_default_env_conversion():
-    """Test that default env (empty dict from default_factory) is handled correctly."""
-    spec = StdioServerSpec(
-        command="node",
-        args=["server.js"],
+# (StdioServerSpec kwargs, expected converted entry without "transport")
+_STDIO_CASES = [
+    pytest.param(
+        # Empty dict - this was causing the bug; env must be omitted, not None
+        {"command": "npx", "args": ["-y", "@cloudflare/playwright-mcp"], "env": {}, "keep_alive": True},
+        {"command": "npx", "args": ["-y", "@cloudflare/playwright-mcp"], "keep_alive": True},
+        id="empty-env",
+    ),
+    pytest.param(
+        {
+            "command": "npx",
+            "args": ["-y", "some-package"],
+            "env": {"API_KEY": "secret123", "DEBUG": "true"},
+            "keep_alive": True,
+        },
+        {
+            "command": "npx",
+            "args": ["-y", "some-package"],
+            "env": {"API_KEY": "secret123", "DEBUG": "true"},
+            "keep_alive": True,
+        },
+        id="populated-env",
+    ),
+    pytest.param(
         # env not specified, uses default_factory=dict → {}
-    )
-
-    servers = {"test": spec}
-    config = servers_to_mcp_config(servers)
-
-    # env should be omitted (empty default dict)
-    assert "env" not in config["test"]
-
-    # Verify FastMCP validation passes
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
-
-
-def test_cwd_none_conversion():
-    """Test that cwd=None is handled correctly (omitted, not included as None)."""
-    spec = StdioServerSpec(
-        command="python",
-        args=["app.py"],
-        cwd=None,  # Explicitly None
-        keep_alive=False,
-    )
-
-    servers = {"test": spec}
-    config = servers_to_mcp_config(servers)
-
-    # cwd should be omitted when None
-    assert "cwd" not in config["test"]
-
-    # Verify FastMCP validation passes
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
-
-
-def test_cwd_with_value():
-    """Test that cwd with value is included correctly."""
-    spec = StdioServerSpec(
-        command="python",
-        args=["app.py"],
-        cwd="/tmp/project",
-        keep_alive=False,
-    )
-
-    servers = {"test": spec}
-    config = servers_to_mcp_config(servers)
-
-    # cwd should be included
-    assert config["test"]["cwd"] == "/tmp/project"
-
-    # Verify FastMCP validation passes
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
+        {"command": "node", "args": ["server.js"]},
+        {"command": "node", "args": ["server.js"], "keep_alive": True},
+        id="default-env",
+    ),
+    pytest.param(
+        {"command": "python", "args": ["app.py"], "cwd": None, "keep_alive": False},
+        {"command": "python", "args": ["app.py"], "keep_alive": False},
+        id="cwd-none",
+    ),
+    pytest.param(
+        {"command": "python", "args": ["app.py"], "cwd": "/tmp/project", "keep_alive": False},
+        {"command": "python", "args": ["app.py"], "cwd": "/tmp/project", "keep_alive": False},
+        id="cwd-set",
+    ),
+]
+
+
+@pytest.mark.parametrize(("spec_kwargs", "expected"), _STDIO_CASES)
+def test_stdio_spec_conversion(spec_kwargs: dict[str, Any], expected: dict[str, Any]) -> None:
+    """Test that empty env and cwd=None are omitted and set values are kept."""
+    config = servers_to_mcp_config({"test": StdioServerSpec(**spec_kwargs)})
+
+    # Whole-entry equality also checks that omitted keys are absent
+    assert config["test"] == {"transport": "stdio", **expected}
+
+
+def test_converted_shapes_pass_fastmcp_validation(
+    mcp_config_validator: Callable[[dict[str, Any]], Any],
+) -> None:
+    """Test FastMCP accepts every converted shape, validated in one batch.
+
+    This is the FastMCP contract test, so other tests only need to compare
+    dicts. Servers are keyed by case id, which validation errors report.
+    """
+    servers = {case.id: StdioServerSpec(**case.values[0]) for case in _STDIO_CASES}
+
+    mcp_config = mcp_config_validator({"mcpServers": servers_to_mcp_config(servers)})
+    assert mcp_config.mcpServers.keys() == servers.keys()
 
 
 def test_multiple_servers_mixed_config():
@@ -141,18 +104,18 @@ def test_multiple_servers_mixed_config():
 
     config = servers_to_mcp_config(servers)
 
-    # Server 1: no env, no cwd
-    assert "env" not in config["server1"]
-    assert "cwd" not in config["server1"]
-
-    # Server 2: has env and cwd
-    assert config["server2"]["env"] == {"KEY": "value"}
-    assert config["server2"]["cwd"] == "/tmp"
-
-    # Server 3: no env, no cwd (defaults)
-    assert "env" not in config["server3"]
-    assert "cwd" not in config["server3"]
-
-    # Verify FastMCP validation passes for all
-    mcp_config = MCPConfig.from_dict({"mcpServers": config})
-    assert mcp_config is not None
+    assert config == {
+        # Server 1: no env, no cwd
+        "server1": {"transport": "stdio", "command": "npx", "args": ["-y", "package1"], "keep_alive": True},
+        # Server 2: has env and cwd
+        "server2": {
+            "transport": "stdio",
+            "command": "npx",
+            "args": ["-y", "package2"],
+            "keep_alive": True,
+            "env": {"KEY": "value"},
+            "cwd": "/tmp",
+        },
+        # Server 3: no env, no cwd (defaults)
+        "server3": {"transport": "stdio", "command": "node", "args": ["script.js"], "keep_alive": True},
+    }
@@ -0,0 +1,119 @@
+"""Unit tests for the persistent discovery cache."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from oneshotmcp.discovery_cache import DiscoveryCache
+from oneshotmcp.orchestrator import DynamicOrchestrator
+
+
+def test_set_persists_across_instances(tmp_path: Path) -> None:
+    """Test entries written by one cache are read by a fresh one."""
+    cache_file = tmp_path / "cache" / "discovery.json"
+
+    DiscoveryCache(cache_file).set("GitHub", "@smithery/github")
+
+    assert DiscoveryCache(cache_file).get("github") == "@smithery/github"
+    assert list(cache_file.parent.iterdir()) == [cache_file]
+
+
+def test_expired_entries_are_ignored(tmp_path: Path) -> None:
+    """Test entries older than the TTL count as misses."""
+    cache_file = tmp_path / "discovery.json"
+    cache_file.write_text(
+        json.dumps(
+            {
+                "old": {"qualified_name": "@old/server", "created_at": time.time() - 120},
+                "new": {"qualified_name": "@new/server", "created_at": time.time()},
+            }
+        )
+    )
+
+    cache = DiscoveryCache(cache_file, ttl=60)
+
+    assert cache.get("old") is None
+    assert cache.get("new") == "@new/server"
+
+
+def test_corrupt_file_is_treated_as_empty(tmp_path: Path) -> None:
+    """Test an unreadable cache file is ignored and replaced on the next write."""
+    cache_file = tmp_path / "discovery.json"
+    cache_file.write_text("{not json")
+
+    cache = DiscoveryCache(cache_file)
+    assert cache.get("github") is None
+
+    cache.set("github", "@smithery/github")
+    assert json.loads(cache_file.read_text())["github"]["qualified_name"] == "@smithery/github"
+
+
+def test_invalidate_removes_entry(tmp_path: Path) -> None:
+    """Test invalidate forgets an entry on disk."""
+    cache_file = tmp_path / "discovery.json"
+    cache = DiscoveryCache(cache_file)
+    cache.set("github", "@smithery/github")
+
+    cache.invalidate("github")
+
+    assert DiscoveryCache(cache_file).get("github") is None
+
+
+@pytest.mark.asyncio
+async def test_discovery_uses_cached_server(tmp_path: Path) -> None:
+    """Test a cached server is tried before research and search run."""
+    cache = DiscoveryCache(tmp_path / "discovery.json")
+    cache.set("github", "@smithery/github")
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+        discovery_cache=cache,
+    )
+    orchestrator._try_candidates = AsyncMock(return_value=True)  # type: ignore[method-assign]
+
+    with patch.object(orchestrator, "_research_capability") as mock_research:
+        assert await orchestrator._discover_and_add_server("github") is True
+
+    mock_research.assert_not_called()
+    orchestrator._try_candidates.assert_awaited_once_with(
+        [{"qualifiedName": "@smithery/github"}], "github"
+    )
+
+
+@pytest.mark.asyncio
+async def test_discovery_records_and_replaces_stale_cache_entry(tmp_path: Path) -> None:
+    """Test a failing cached server is replaced by the one full discovery finds."""
+    from oneshotmcp.config import StdioServerSpec
+
+    cache = DiscoveryCache(tmp_path / "discovery.json")
+    cache.set("github", "@stale/github")
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+        discovery_cache=cache,
+    )
+
+    async def fake_local_install(qualified_name: str, capability: str, **_: object) -> bool:
+        if qualified_name == "@stale/github":
+            return False
+        orchestrator.servers[capability] = StdioServerSpec(command="npx", args=["-y", qualified_name])
+        return True
+
+    orchestrator._try_local_installation = fake_local_install  # type: ignore[method-assign]
+    orchestrator.smithery.get_server = AsyncMock(side_effect=RuntimeError("no hosted"))  # type: ignore[method-assign]
+    orchestrator._research_capability = AsyncMock(return_value={})  # type: ignore[method-assign]
+    orchestrator._enhanced_search_for_capability = AsyncMock(  # type: ignore[method-assign]
+        return_value=[{"qualifiedName": "@smithery/github"}]
+    )
+
+    assert await orchestrator._discover_and_add_server("github") is True
+    assert DiscoveryCache(tmp_path / "discovery.json").get("github") == "@smithery/github"
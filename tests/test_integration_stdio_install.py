@@ -14,19 +14,22 @@ Fixed in:
 """
 
 import pytest
-from fastmcp.mcp_config import MCPConfig
 
 from oneshotmcp.config import StdioServerSpec, servers_to_mcp_config
 from oneshotmcp.local_installer import LocalMCPInstaller
 
 
+@pytest.fixture(scope="class")
+def installer():
+    """One installer per test class (it holds no state)."""
+    return LocalMCPInstaller()
+
+
 class TestStdioInstallationIntegration:
     """End-to-end test for stdio server installation."""
 
-    def test_local_installer_creates_valid_spec(self):
+    def test_local_installer_creates_valid_spec(self, installer):
         """Test that LocalMCPInstaller creates FastMCP-compatible specs."""
-        installer = LocalMCPInstaller()
-
         # Simulate creating a spec for a package with no config requirements
         spec = installer.create_stdio_server_spec(
             package_name="@cloudflare/playwright-mcp",
@@ -43,19 +46,17 @@ class TestStdioInstallationIntegration:
         # Convert to FastMCP config
         config = servers_to_mcp_config({"test": spec})
 
-        # Verify env is omitted (not set to None)
-        assert "env" not in config["test"]
-        assert config["test"]["command"] == "npx"
-        assert config["test"]["args"] == ["-y", "@cloudflare/playwright-mcp"]
-
-        # Verify FastMCP validation passes (this was failing before fix)
-        mcp_config = MCPConfig.from_dict({"mcpServers": config})
-        assert mcp_config is not None
+        # Verify env is omitted (not set to None); FastMCP accepting this
+        # shape is covered by the empty-env case in test_config_stdio_fix
+        assert config["test"] == {
+            "transport": "stdio",
+            "command": "npx",
+            "args": ["-y", "@cloudflare/playwright-mcp"],
+            "keep_alive": True,
+        }
 
-    def test_local_installer_with_env_vars(self):
+    def test_local_installer_with_env_vars(self, installer, mcp_config_validator):
         """Test that env vars from config requirements are handled correctly."""
-        installer = LocalMCPInstaller()
-
         # Simulate a package that requires API key via env var
         config_requirements = {
             "required": ["apiKey"],
@@ -84,16 +85,14 @@ class TestStdioInstallationIntegration:
         assert config["test"]["env"] == {"SERVICE_API_KEY": "secret123"}
 
         # Verify FastMCP validation passes
-        mcp_config = MCPConfig.from_dict({"mcpServers": config})
+        mcp_config = mcp_config_validator({"mcpServers": config})
         assert mcp_config is not None
 
-    def test_vercel_scenario_simulation(self):
+    def test_vercel_scenario_simulation(self, installer, mcp_config_validator):
         """Simulate the exact bug scenario: install vercel mcp → wrong server selected."""
         # This simulates what would happen if Playwright was selected
         # (before ranking fix, score=0 servers were attempted)
 
-        installer = LocalMCPInstaller()
-
         # Create spec for Playwright (wrong server, but npm-installable)
         playwright_spec = installer.create_stdio_server_spec(
             package_name="@cloudflare/playwright-mcp",
@@ -107,17 +106,15 @@ class TestStdioInstallationIntegration:
 
         # Before fix: This would fail with "env: Input should be a valid dictionary"
         # After fix: This passes (env is omitted)
-        mcp_config = MCPConfig.from_dict({"mcpServers": config})
+        mcp_config = mcp_config_validator({"mcpServers": config})
         assert mcp_config is not None
 
-        # Verify config structure
-        assert "env" not in config["vercel"]  # Empty env omitted
+        # Verify config structure (empty env omitted)
+        assert config["vercel"].keys() == {"transport", "command", "args", "keep_alive"}
         assert config["vercel"]["command"] == "npx"
 
-    def test_multiple_stdio_servers_rebuild(self):
+    def test_multiple_stdio_servers_rebuild(self, installer, mcp_config_validator):
         """Test agent rebuild scenario with multiple stdio servers."""
-        installer = LocalMCPInstaller()
-
         # Create multiple servers with different env configurations
         server1 = installer.create_stdio_server_spec(
             package_name="@package/server1",
@@ -142,7 +139,7 @@ class TestStdioInstallationIntegration:
         assert config["server2"]["env"] == {"API_KEY": "value123"}  # Populated included
 
         # Verify FastMCP validation passes for all servers
-        mcp_config = MCPConfig.from_dict({"mcpServers": config})
+        mcp_config = mcp_config_validator({"mcpServers": config})
         assert mcp_config is not None
 
         # Verify we can access both servers
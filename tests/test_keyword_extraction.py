@@ -2,156 +2,144 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, Mock
+from collections.abc import Callable
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
 from oneshotmcp.orchestrator import DynamicOrchestrator
 
-
+_VERCEL_DESCRIPTION = "Vercel is a cloud platform for deploying web applications"
+
+# (LLM reply or None, LLM error or None, description, check on the keywords)
+_EXTRACTION_CASES = [
+    pytest.param(
+        # Specific keywords (no generic terms)
+        "vercel, deployment, edge, serverless, hosting",
+        None,
+        _VERCEL_DESCRIPTION,
+        lambda k: (
+            "vercel" in k
+            and ("deployment" in k or "edge" in k or "serverless" in k)
+            and "cloud" not in k  # Generic term filtered
+            and "platform" not in k  # Generic term filtered
+        ),
+        id="filters-generic-terms",
+    ),
+    pytest.param(
+        # Reply WITHOUT capability name: it should be prepended
+        "deployment, hosting, edge, serverless",
+        None,
+        _VERCEL_DESCRIPTION,
+        lambda k: k[0] == "vercel",
+        id="always-includes-capability",
+    ),
+    pytest.param(
+        # LLM failure: naive fallback, which also filters generic terms
+        None,
+        Exception("LLM API error"),
+        _VERCEL_DESCRIPTION,
+        lambda k: "vercel" in k and "cloud" not in k and "platform" not in k,
+        id="fallback-on-llm-failure",
+    ),
+    pytest.param(
+        # Many keywords: limited to 5
+        "vercel, deployment, edge, serverless, hosting, cdn, nextjs, react, build",
+        None,
+        "Vercel deployment platform",
+        lambda k: len(k) <= 5,
+        id="limits-to-5",
+    ),
+]
+
+# (search results, research, expected qualified names in ranked order)
+_RANKING_CASES = [
+    pytest.param(
+        [
+            {"qualifiedName": "@vercel/deployment-mcp", "description": "Vercel deployment tools"},
+            {
+                "qualifiedName": "@cloudflare/playwright-mcp",
+                "description": "Browser automation with deployment features",
+            },
+        ],
+        {"keywords": ["vercel", "deployment", "edge"]},
+        ["@vercel/deployment-mcp", "@cloudflare/playwright-mcp"],
+        id="keyword-match-below-exact-match",
+    ),
+    pytest.param(
+        [{"qualifiedName": "@acme/vercel-tools"}, {"qualifiedName": "@vercel/mcp"}],
+        {},
+        ["@vercel/mcp", "@acme/vercel-tools"],
+        id="scoped-name-above-name-match",
+    ),
+    pytest.param(
+        [
+            {"qualifiedName": "@a/edge", "description": "Edge functions"},
+            {"qualifiedName": "@b/deploy", "description": "Deploy to Vercel"},
+        ],
+        {"keywords": ["edge"]},
+        ["@b/deploy", "@a/edge"],
+        id="description-match-above-keyword-match",
+    ),
+    pytest.param(
+        [
+            {"qualifiedName": "@x/sheets", "description": "Spreadsheets"},
+            {"qualifiedName": "@smithery/vercel"},
+        ],
+        {"keywords": ["deployment"]},
+        ["@smithery/vercel"],
+        id="unrelated-filtered-out",
+    ),
+]
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestKeywordExtraction:
     """Test suite for LLM-based keyword extraction."""
 
-    @pytest.mark.asyncio
-    async def test_extract_keywords_filters_generic_terms(self) -> None:
-        """Test that generic terms like 'cloud' and 'platform' are filtered out."""
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=False,
-        )
-
-        # Mock LLM response with specific keywords (no generic terms)
-        mock_response = Mock()
-        mock_response.content = "vercel, deployment, edge, serverless, hosting"
+    @pytest.mark.parametrize(("content", "error", "description", "check"), _EXTRACTION_CASES)
+    async def test_extract_keywords(
+        self,
+        orchestrator_factory: Callable[..., DynamicOrchestrator],
+        content: str | None,
+        error: Exception | None,
+        description: str,
+        check: Callable[[list[str]], bool],
+    ) -> None:
+        """Test keyword extraction from the LLM reply, or its fallback."""
+        orchestrator = orchestrator_factory(verbose=False)
 
         orchestrator.model = AsyncMock()
-        orchestrator.model.ainvoke = AsyncMock(return_value=mock_response)
-
-        keywords = await orchestrator._extract_keywords_with_llm(
-            capability="vercel",
-            description="Vercel is a cloud platform for deploying web applications",
-        )
-
-        # Should extract specific keywords, not generic terms
-        assert "vercel" in keywords
-        assert "deployment" in keywords or "edge" in keywords or "serverless" in keywords
-        assert "cloud" not in keywords  # Generic term filtered
-        assert "platform" not in keywords  # Generic term filtered
-
-    @pytest.mark.asyncio
-    async def test_extract_keywords_always_includes_capability(self) -> None:
-        """Test that capability name is always included in keywords."""
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=False,
+        orchestrator.model.ainvoke = AsyncMock(
+            return_value=SimpleNamespace(content=content), side_effect=error
         )
 
-        # Mock LLM response WITHOUT capability name
-        mock_response = Mock()
-        mock_response.content = "deployment, hosting, edge, serverless"
-
-        orchestrator.model = AsyncMock()
-        orchestrator.model.ainvoke = AsyncMock(return_value=mock_response)
-
         keywords = await orchestrator._extract_keywords_with_llm(
             capability="vercel",
-            description="Vercel is a cloud platform for deploying web applications",
+            description=description,
         )
 
-        # Capability name should be prepended if missing
-        assert keywords[0] == "vercel"
-
-    @pytest.mark.asyncio
-    async def test_extract_keywords_fallback_on_llm_failure(self) -> None:
-        """Test fallback to naive extraction when LLM fails."""
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=False,
-        )
-
-        # Mock LLM failure
-        orchestrator.model = AsyncMock()
-        orchestrator.model.ainvoke = AsyncMock(side_effect=Exception("LLM API error"))
-
-        keywords = await orchestrator._extract_keywords_with_llm(
-            capability="vercel",
-            description="Vercel is a cloud platform for deploying web applications",
-        )
-
-        # Fallback should work
-        assert "vercel" in keywords
-        # Fallback should also filter generic terms
-        assert "cloud" not in keywords
-        assert "platform" not in keywords
-
-    @pytest.mark.asyncio
-    async def test_extract_keywords_limits_to_5(self) -> None:
-        """Test that extracted keywords are limited to 5."""
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=False,
-        )
-
-        # Mock LLM response with many keywords
-        mock_response = Mock()
-        mock_response.content = "vercel, deployment, edge, serverless, hosting, cdn, nextjs, react, build"
-
-        orchestrator.model = AsyncMock()
-        orchestrator.model.ainvoke = AsyncMock(return_value=mock_response)
-
-        keywords = await orchestrator._extract_keywords_with_llm(
-            capability="vercel",
-            description="Vercel deployment platform",
-        )
-
-        # Should be limited to 5
-        assert len(keywords) <= 5
+        assert check(keywords), keywords
 
 
 class TestKeywordRanking:
     """Test that keyword-based ranking uses lower scores."""
 
-    @pytest.mark.asyncio
-    async def test_keyword_match_lower_score_than_exact_match(self) -> None:
-        """Test that keyword matches score lower than exact matches."""
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=False,
-        )
-
-        servers = [
-            {
-                "qualifiedName": "@vercel/deployment-mcp",
-                "description": "Vercel deployment tools",
-            },
-            {
-                "qualifiedName": "@cloudflare/playwright-mcp",
-                "description": "Browser automation with deployment features",
-            },
-        ]
-
-        research = {"keywords": ["vercel", "deployment", "edge"]}
-
-        ranked = orchestrator._rank_servers(
-            capability="vercel", servers=servers, research=research
-        )
+    @pytest.mark.parametrize(("servers", "research", "expected"), _RANKING_CASES)
+    def test_rank_servers(
+        self,
+        orchestrator_factory: Callable[..., DynamicOrchestrator],
+        servers: list[dict[str, str]],
+        research: dict[str, list[str]],
+        expected: list[str],
+    ) -> None:
+        """Test servers are ordered by match tier, with unrelated ones dropped."""
+        orchestrator = orchestrator_factory(verbose=False)
 
-        # Exact match (vercel in qualified name) should rank first
-        assert ranked[0]["qualifiedName"] == "@vercel/deployment-mcp"
+        ranked = orchestrator._rank_servers(capability="vercel", servers=servers, research=research)
 
-        # Keyword match should rank second (or be filtered if score=0)
-        if len(ranked) > 1:
-            assert ranked[1]["qualifiedName"] == "@cloudflare/playwright-mcp"
+        assert [s["qualifiedName"] for s in ranked] == expected
 
 
 if __name__ == "__main__":
@@ -2,140 +2,57 @@
 
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, Mock, patch
+import builtins
+import subprocess
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, Mock
 
+import httpx
 import pytest
 
-from oneshotmcp.config import StdioServerSpec
-from oneshotmcp.oauth import OAuthConfig, TokenStore
+from oneshotmcp import local_installer
+from oneshotmcp.config import HTTPServerSpec, ServerSpec, StdioServerSpec
+from oneshotmcp.oauth import OAuthConfig
 from oneshotmcp.orchestrator import DynamicOrchestrator
 from oneshotmcp.registry import OAuthRequired
+from tests.fixtures.token_store import MemoryTokenStore
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-@pytest.mark.asyncio
-async def test_orchestrator_oauth_fails_then_local_install_succeeds() -> None:
-    """Test orchestrator falls back to local install when OAuth fails."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        token_file = Path(tmpdir) / "tokens.json"
-        token_store = TokenStore(token_file=token_file)
+# Ranked search results; _try_candidates only reads them
+SEARCH_RESULTS_CONTEXT7 = [
+    {
+        "qualifiedName": "@upstash/context7-mcp",
+        "displayName": "Context7",
+        "description": "Context7 documentation server",
+    }
+]
+SEARCH_RESULTS_TWO = [
+    {"qualifiedName": "@first/server", "displayName": "First"},
+    {"qualifiedName": "@second/server", "displayName": "Second"},
+]
 
-        orchestrator = DynamicOrchestrator(
-            model="openai:gpt-4.1-nano",
-            initial_servers={},
-            smithery_key="test-key",
-            verbose=True,
-            token_store=token_store,
-        )
 
-        # Mock search results
-        search_results = [
-            {
-                "qualifiedName": "@upstash/context7-mcp",
-                "displayName": "Context7",
-                "description": "Context7 documentation server",
-            }
-        ]
-
-        # Mock OAuth exception
-        oauth_exc = OAuthRequired(
-            message="OAuth required",
-            server_name="@upstash/context7-mcp",
-            oauth_config=OAuthConfig(
-                authorization_endpoint="https://oauth.smithery.ai/authorize",
-                token_endpoint="https://oauth.smithery.ai/token",
-                resource="https://server.smithery.ai/context7/mcp",
-                scopes=["read"],
-            ),
-            auth_url="https://oauth.smithery.ai/authorize?...",
-        )
-
-        # Mock Smithery metadata response
-        smithery_metadata = {
-            "qualifiedName": "@upstash/context7-mcp",
-            "displayName": "Context7",
-            "connections": [
-                {
-                    "type": "http",
-                    "deploymentUrl": "https://server.smithery.ai/@upstash/context7-mcp/mcp",
-                    "configSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": [],
-                    },
-                }
-            ],
-        }
-
-        # User declines OAuth
-        with patch("builtins.input", return_value="no"):
-            # Mock smithery.get_server to raise OAuthRequired
-            with patch.object(orchestrator.smithery, "get_server", side_effect=oauth_exc):
-                # Mock httpx for metadata fetch in local install
-                with patch("httpx.AsyncClient") as mock_httpx_class:
-                    mock_httpx = AsyncMock()
-                    mock_httpx.__aenter__.return_value = mock_httpx
-
-                    # Mock metadata response
-                    metadata_response = Mock()
-                    metadata_response.status_code = 200
-                    metadata_response.json.return_value = smithery_metadata
-                    metadata_response.raise_for_status = Mock()
-                    mock_httpx.get = AsyncMock(return_value=metadata_response)
-
-                    mock_httpx_class.return_value = mock_httpx
-
-                    # Mock LocalMCPInstaller
-                    with patch("oneshotmcp.local_installer.LocalMCPInstaller") as MockInstaller:
-                        mock_installer = Mock()
-                        mock_installer.attempt_local_installation = AsyncMock(
-                            return_value=StdioServerSpec(
-                                command="npx",
-                                args=["-y", "@upstash/context7-mcp"],
-                                keep_alive=True,
-                            )
-                        )
-                        MockInstaller.return_value = mock_installer
-
-                        # Try adding server
-                        success = await orchestrator._try_candidates(
-                            ranked_servers=search_results,
-                            capability="context7",
-                        )
-
-                        # Should succeed via local installation
-                        assert success is True
-
-                        # Verify server was added as stdio
-                        assert "context7" in orchestrator.servers
-                        spec = orchestrator.servers["context7"]
-                        assert isinstance(spec, StdioServerSpec)
-                        assert spec.command == "npx"
-                        assert "@upstash/context7-mcp" in spec.args
-
-
-@pytest.mark.asyncio
-async def test_orchestrator_both_oauth_and_local_fail() -> None:
-    """Test orchestrator tries next candidate when both OAuth and local fail."""
-    orchestrator = DynamicOrchestrator(
-        model="openai:gpt-4.1-nano",
-        initial_servers={},
-        smithery_key="test-key",
-        verbose=False,
-    )
+def _patch_httpx(monkeypatch: pytest.MonkeyPatch, payload: dict[str, Any]) -> AsyncMock:
+    """Patch httpx.AsyncClient so every GET returns a 200 with `payload` as JSON."""
+    response = SimpleNamespace(status_code=200, json=lambda: payload, raise_for_status=lambda: None)
+
+    client = AsyncMock()
+    client.__aenter__.return_value = client
+    client.get = AsyncMock(return_value=response)
 
-    # Two candidates
-    search_results = [
-        {"qualifiedName": "@first/server", "displayName": "First"},
-        {"qualifiedName": "@second/server", "displayName": "Second"},
-    ]
+    monkeypatch.setattr(httpx, "AsyncClient", Mock(return_value=client))
+    return client
 
-    # Mock OAuth exception for first server
-    oauth_exc = OAuthRequired(
+
+@pytest.fixture(scope="module")
+def first_server_oauth_exc() -> OAuthRequired:
+    """OAuthRequired for the first of two search candidates."""
+    return OAuthRequired(
         message="OAuth required",
         server_name="@first/server",
-        oauth_config=OAuthConfig(
+        oauth_config=OAuthConfig.model_construct(
             authorization_endpoint="https://oauth.test/authorize",
             token_endpoint="https://oauth.test/token",
             resource="https://server.test/mcp",
@@ -143,46 +60,90 @@ async def test_orchestrator_both_oauth_and_local_fail() -> None:
         auth_url="https://oauth.test/authorize?...",
     )
 
+
+@pytest.fixture
+def fake_installer(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Replace LocalMCPInstaller with a fake; tests set its install result."""
+    installer = Mock()
+    monkeypatch.setattr(local_installer, "LocalMCPInstaller", Mock(return_value=installer))
+    return installer
+
+
+_CONTEXT7_STDIO_SPEC = StdioServerSpec.model_construct(
+    command="npx",
+    args=["-y", "@upstash/context7-mcp"],
+    keep_alive=True,
+)
+_SECOND_SERVER_SPEC = HTTPServerSpec.model_construct(url="https://second.server/mcp")
+
+# (ranked servers, OAuthRequired fixture for the first one, local install result,
+#  capability, spec expected to be added)
+_FALLBACK_CASES = [
+    pytest.param(
+        SEARCH_RESULTS_CONTEXT7,
+        "context7_oauth_exc",
+        _CONTEXT7_STDIO_SPEC,
+        "context7",
+        _CONTEXT7_STDIO_SPEC,
+        id="local-install-succeeds",
+    ),
+    pytest.param(
+        SEARCH_RESULTS_TWO,
+        "first_server_oauth_exc",
+        None,
+        "test",
+        _SECOND_SERVER_SPEC,
+        id="local-install-fails-next-candidate",
+    ),
+]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    ("ranked_servers", "oauth_exc_fixture", "installed", "capability", "expected"),
+    _FALLBACK_CASES,
+)
+async def test_orchestrator_falls_back_when_oauth_declined(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+    memory_token_store: MemoryTokenStore,
+    fake_installer: Mock,
+    ranked_servers: list[dict[str, str]],
+    oauth_exc_fixture: str,
+    installed: StdioServerSpec | None,
+    capability: str,
+    expected: ServerSpec,
+) -> None:
+    """Test a declined OAuth server is installed locally, or skipped for the next one."""
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4.1-nano",
+        initial_servers={},
+        smithery_key="test-key",
+        verbose=True,
+        token_store=memory_token_store,
+    )
+
     # User declines OAuth
-    with patch("builtins.input", return_value="no"):
-        # First server raises OAuth, second server succeeds
-        with patch.object(
-            orchestrator.smithery,
-            "get_server",
-            side_effect=[
-                oauth_exc,  # First attempt
-                Mock(url="https://second.server/mcp"),  # Second attempt
-            ],
-        ):
-            # Mock LocalMCPInstaller to fail for first server
-            with patch("oneshotmcp.local_installer.LocalMCPInstaller") as MockInstaller:
-                mock_installer = Mock()
-                mock_installer.attempt_local_installation = AsyncMock(return_value=None)
-                MockInstaller.return_value = mock_installer
-
-                # Mock httpx for metadata fetch
-                with patch("httpx.AsyncClient") as mock_httpx_class:
-                    mock_httpx = AsyncMock()
-                    mock_httpx.__aenter__.return_value = mock_httpx
-                    metadata_response = Mock()
-                    metadata_response.json.return_value = {"qualifiedName": "@first/server"}
-                    metadata_response.raise_for_status = Mock()
-                    mock_httpx.get = AsyncMock(return_value=metadata_response)
-                    mock_httpx_class.return_value = mock_httpx
-
-                    # Try adding
-                    success = await orchestrator._try_candidates(
-                        ranked_servers=search_results,
-                        capability="test",
-                    )
-
-                    # Should succeed with second server
-                    assert success is True
-                    assert "test" in orchestrator.servers
-
-
-@pytest.mark.asyncio
-async def test_local_installation_with_api_key_from_env() -> None:
+    monkeypatch.setattr(builtins, "input", Mock(return_value="no"))
+    # First server raises OAuth, a second one would be hosted
+    orchestrator.smithery.get_server = AsyncMock(  # type: ignore[method-assign]
+        side_effect=[request.getfixturevalue(oauth_exc_fixture), _SECOND_SERVER_SPEC]
+    )
+    # Metadata fetch and install attempt in local install
+    _patch_httpx(monkeypatch, {"qualifiedName": ranked_servers[0]["qualifiedName"]})
+    fake_installer.attempt_local_installation = AsyncMock(return_value=installed)
+
+    success = await orchestrator._try_candidates(
+        ranked_servers=ranked_servers,
+        capability=capability,
+    )
+
+    assert success is True
+    fake_installer.attempt_local_installation.assert_awaited()
+    assert orchestrator.servers == {capability: expected}
+
+
+async def test_local_installation_with_api_key_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test local installation extracts API key from environment."""
     orchestrator = DynamicOrchestrator(
         model="openai:gpt-4.1-nano",
@@ -210,36 +171,23 @@ async def test_local_installation_with_api_key_from_env() -> None:
         ],
     }
 
-    # Mock httpx for metadata fetch
-    with patch("httpx.AsyncClient") as mock_httpx_class:
-        mock_httpx = AsyncMock()
-        mock_httpx.__aenter__.return_value = mock_httpx
-
-        metadata_response = Mock()
-        metadata_response.json.return_value = smithery_metadata
-        metadata_response.raise_for_status = Mock()
-        mock_httpx.get = AsyncMock(return_value=metadata_response)
-
-        mock_httpx_class.return_value = mock_httpx
-
-        # Mock environment variable
-        with patch("os.getenv", return_value="test-api-key-from-env"):
-            # Mock LocalMCPInstaller
-            with patch("oneshotmcp.local_installer.subprocess.run") as mock_subprocess:
-                # Mock npm available
-                mock_subprocess.return_value = Mock(returncode=0)
-
-                # Try local installation
-                success = await orchestrator._try_local_installation(
-                    qualified_name="@upstash/context7-mcp",
-                    capability="context7",
-                )
-
-                # Should succeed
-                assert success is True
-                assert "context7" in orchestrator.servers
-
-                spec = orchestrator.servers["context7"]
-                assert isinstance(spec, StdioServerSpec)
-                # Should have env var set
-                assert spec.env.get("CONTEXT7_API_KEY") == "test-api-key-from-env"
+    _patch_httpx(monkeypatch, smithery_metadata)
+    # Mock environment variable
+    monkeypatch.setenv("CONTEXT7_API_KEY", "test-api-key-from-env")
+    # Mock npm available
+    monkeypatch.setattr(subprocess, "run", Mock(return_value=Mock(returncode=0)))
+
+    # Try local installation
+    success = await orchestrator._try_local_installation(
+        qualified_name="@upstash/context7-mcp",
+        capability="context7",
+    )
+
+    # Should succeed
+    assert success is True
+    assert "context7" in orchestrator.servers
+
+    spec = orchestrator.servers["context7"]
+    assert isinstance(spec, StdioServerSpec)
+    # Should have env var set
+    assert spec.env.get("CONTEXT7_API_KEY") == "test-api-key-from-env"
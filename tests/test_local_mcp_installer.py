@@ -53,6 +53,15 @@ class TestLocalMCPInstaller:
         }
         assert installer.is_npm_installable(metadata) is False
 
+    def test_is_npm_installable_rejects_malformed_scopes(self) -> None:
+        """Test scope/package structure is enforced, not just the character set."""
+        installer = LocalMCPInstaller()
+
+        for name in ["", "@", "@/pkg", "@scope/", "scope/pkg", "@scope/pkg/extra", "pkg@1"]:
+            assert installer.is_npm_installable({"qualifiedName": name}) is False, name
+
+        assert installer.is_npm_installable({"qualifiedName": "@My_Scope/Pkg.js"}) is True
+
     def test_extract_config_from_smithery_metadata(self) -> None:
         """Test extracting required config from Smithery metadata."""
         installer = LocalMCPInstaller()
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import socket
+import stat
+import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
@@ -9,6 +13,7 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 from oneshotmcp.oauth import (
+    BrowserAuthHandler,
     OAuthConfig,
     OAuthError,
     PKCEAuthenticator,
@@ -89,7 +94,8 @@ class TestPKCEAuthenticator:
         # Mock httpx.AsyncClient
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             # Mock the token response
             mock_response = Mock()
@@ -124,7 +130,8 @@ class TestPKCEAuthenticator:
         # Mock httpx.AsyncClient with error response
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             # Mock 400 response
             import httpx
@@ -162,7 +169,8 @@ class TestPKCEAuthenticator:
         # Mock httpx.AsyncClient
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             # Mock refresh response
             mock_response = Mock()
@@ -192,7 +200,8 @@ class TestPKCEAuthenticator:
         # Mock httpx.AsyncClient with error
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             import httpx
             mock_response = Mock()
@@ -238,6 +247,20 @@ class TestTokenStore:
             assert retrieved["refresh_token"] == "xyz789"
             assert "created_at" in retrieved  # Auto-added timestamp
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions only")
+    def test_files_are_owner_only(self) -> None:
+        """Test token and key files are written with 0600 permissions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            token_file.write_bytes(b"")
+            token_file.chmod(0o644)
+            store = TokenStore(token_file=token_file)
+
+            store.save_tokens("test-server", {"access_token": "abc123"})
+
+            for path in (token_file, token_file.parent / "key"):
+                assert stat.S_IMODE(path.stat().st_mode) == 0o600, path
+
     def test_get_nonexistent_tokens(self) -> None:
         """Test retrieving tokens for nonexistent server."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -300,6 +323,51 @@ class TestTokenStore:
             assert retrieved is not None
             assert retrieved["access_token"] == "secret123"
 
+    def test_saving_unchanged_tokens_skips_write(self) -> None:
+        """Test re-saving identical tokens doesn't re-encrypt the file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            store = TokenStore(token_file=token_file)
+            tokens = {"access_token": "abc123", "created_at": 1700000000}
+            store.save_tokens("test-server", dict(tokens))
+
+            with patch.object(store, "_encrypt", wraps=store._encrypt) as mock_encrypt:
+                store.save_tokens("test-server", dict(tokens))
+                mock_encrypt.assert_not_called()
+
+                store.save_tokens("test-server", {**tokens, "access_token": "new"})
+                mock_encrypt.assert_called_once()
+
+    def test_saving_mutated_tokens_persists_them(self) -> None:
+        """Test tokens read, changed and saved again reach the file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            store = TokenStore(token_file=token_file)
+            store.save_tokens("test-server", {"access_token": "old"})
+
+            tokens = store.get_tokens("test-server")
+            assert tokens is not None
+            tokens["access_token"] = "new"
+            store.save_tokens("test-server", tokens)
+
+            reloaded = TokenStore(token_file=token_file).get_tokens("test-server")
+            assert reloaded is not None
+            assert reloaded["access_token"] == "new"
+
+    def test_legacy_fernet_file_is_migrated(self) -> None:
+        """Test token files written with Fernet are read and re-encrypted."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            store = TokenStore(token_file=token_file)
+            token_file.write_bytes(
+                store._get_fernet().encrypt(b'{"legacy-server": {"access_token": "old"}}')
+            )
+
+            tokens = TokenStore(token_file=token_file).get_tokens("legacy-server")
+            assert tokens == {"access_token": "old"}
+            assert token_file.read_bytes()[:1] == b"\x81"
+            assert TokenStore(token_file=token_file).get_tokens("legacy-server") == tokens
+
     def test_empty_token_file(self) -> None:
         """Test handling of nonexistent token file."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -314,6 +382,104 @@ class TestTokenStore:
             tokens = store.get_tokens("any-server")
             assert tokens is None
 
+    def test_reads_are_cached_until_file_changes(self) -> None:
+        """Test repeated reads decrypt once and external writes invalidate the cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            store = TokenStore(token_file=token_file)
+            store.save_tokens("server1", {"access_token": "token1"})
+
+            with patch.object(store, "_decrypt", wraps=store._decrypt) as mock_decrypt:
+                assert store.get_tokens("server1") is not None
+                assert store.list_servers() == ["server1"]
+                mock_decrypt.assert_not_called()
+
+                # Another instance writes the same file
+                TokenStore(token_file=token_file).save_tokens(
+                    "server2", {"access_token": "token2"}
+                )
+
+                assert set(store.list_servers()) == {"server1", "server2"}
+                mock_decrypt.assert_called_once()
+
+    def test_cache_is_not_shared_with_callers(self) -> None:
+        """Test mutating saved or returned token dicts doesn't change stored tokens."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            token_file = Path(tmpdir) / "tokens.json"
+            store = TokenStore(token_file=token_file)
+
+            saved = {"access_token": "original"}
+            store.save_tokens("test-server", saved)
+            saved["access_token"] = "mutated"
+
+            retrieved = store.get_tokens("test-server")
+            assert retrieved is not None
+            retrieved["access_token"] = "mutated"
+
+            tokens = store.get_tokens("test-server")
+            assert tokens is not None
+            assert tokens["access_token"] == "original"
+
+
+class TestBrowserAuthHandler:
+    """Tests for the local OAuth callback server."""
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            return int(sock.getsockname()[1])
+
+    async def _authorize_with_callback(self, query: str) -> tuple[str | Exception, bytes]:
+        """Run authorize() while a fake browser hits the callback URL with `query`."""
+        port = self._free_port()
+        handler = BrowserAuthHandler(f"http://localhost:{port}/callback", timeout=5.0)
+        browser: list[asyncio.Task[bytes]] = []
+
+        async def _visit_callback() -> bytes:
+            reader, writer = await asyncio.open_connection("localhost", port)
+            writer.write(f"GET /callback?{query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        def _open_browser(_url: str) -> bool:
+            browser.append(asyncio.get_running_loop().create_task(_visit_callback()))
+            return True
+
+        with (
+            patch("oneshotmcp.oauth.validate_oauth_url", AsyncMock(return_value=(True, ""))),
+            patch("webbrowser.open", side_effect=_open_browser),
+        ):
+            try:
+                result: str | Exception = await handler.authorize("https://auth.example.com/a")
+            except OAuthError as exc:
+                result = exc
+
+        return result, await browser[0]
+
+    @pytest.mark.asyncio
+    async def test_authorize_receives_code(self) -> None:
+        """Test the callback server returns the code and a success page."""
+        result, response = await self._authorize_with_callback("code=abc123&state=xyz")
+
+        assert result == "abc123"
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert b"Authorization Successful" in response
+
+    @pytest.mark.asyncio
+    async def test_authorize_reports_error(self) -> None:
+        """Test an error callback fails authorization with the provider's error."""
+        result, response = await self._authorize_with_callback(
+            "error=access_denied&error_description=User+denied+%3Cb%3E"
+        )
+
+        assert isinstance(result, OAuthError)
+        assert "access_denied" in str(result)
+        assert response.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"User denied &lt;b&gt;" in response  # Description is HTML-escaped
+
 
 class TestOAuthConfig:
     """Tests for OAuth configuration model."""
@@ -356,7 +522,8 @@ async def test_discover_oauth_metadata() -> None:
     # Mock httpx.AsyncClient
     with patch("httpx.AsyncClient") as mock_client_class:
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock discovery response
         mock_response = Mock()
@@ -381,7 +548,111 @@ async def test_discover_oauth_metadata() -> None:
         assert config.token_endpoint == "https://auth.example.com/token"
         assert config.scopes == ["read", "write"]
 
-        # Verify correct discovery URL was called (RFC 8414)
-        mock_client.get.assert_called_once()
-        call_args = mock_client.get.call_args[0][0]
-        assert call_args == "https://mcp.example.com/.well-known/oauth-authorization-server"
+        # Verify RFC 8414 is requested first, with RFC 9728 fetched alongside
+        requested = [call.args[0] for call in mock_client.get.call_args_list]
+        assert requested == [
+            "https://mcp.example.com/.well-known/oauth-authorization-server",
+            "https://mcp.example.com/.well-known/oauth-protected-resource",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_discover_oauth_metadata_falls_back_to_rfc9728() -> None:
+    """Test RFC 9728 metadata is used when RFC 8414 discovery returns an error."""
+    import httpx
+
+    from oneshotmcp.oauth import discover_oauth_metadata
+
+    resource_url = "https://mcp.example.com/server"
+
+    not_found = Mock()
+    not_found.raise_for_status.side_effect = httpx.HTTPStatusError(
+        "Not Found", request=Mock(), response=Mock(status_code=404)
+    )
+    protected_resource = Mock()
+    protected_resource.raise_for_status = Mock()
+    protected_resource.json.return_value = {
+        "resource": "https://mcp.example.com/",
+        "authorization_endpoint": "https://auth.example.com/authorize",
+        "token_endpoint": "https://auth.example.com/token",
+    }
+
+    async def fake_get(url: str) -> Mock:
+        if url.endswith("/oauth-authorization-server"):
+            return not_found
+        return protected_resource
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client_class.return_value = mock_client
+        mock_client.get = AsyncMock(side_effect=fake_get)
+
+        config = await discover_oauth_metadata(resource_url)
+
+    assert config.resource == "https://mcp.example.com/"
+    assert config.token_endpoint == "https://auth.example.com/token"
+
+
+@pytest.mark.asyncio
+async def test_discover_oauth_metadata_wraps_connection_errors() -> None:
+    """Test transport failures surface as OAuthError."""
+    import httpx
+
+    from oneshotmcp.oauth import OAuthError, discover_oauth_metadata
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client_class.return_value = mock_client
+        mock_client.get = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+
+        with pytest.raises(OAuthError, match="OAuth discovery failed"):
+            await discover_oauth_metadata("https://mcp.example.com/server")
+
+
+@pytest.mark.asyncio
+async def test_discover_oauth_metadata_is_cached() -> None:
+    """Test discovery hits the network once per resource, even concurrently."""
+    from oneshotmcp.oauth import discover_oauth_metadata
+
+    resource_url = "https://mcp.example.com/server"
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client_class.return_value = mock_client
+
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "authorization_endpoint": "https://auth.example.com/authorize",
+            "token_endpoint": "https://auth.example.com/token",
+            "scopes_supported": ["read"],
+        }
+        mock_response.raise_for_status = Mock()
+        mock_client.get = AsyncMock(return_value=mock_response)
+
+        first, second = await asyncio.gather(
+            discover_oauth_metadata(resource_url),
+            discover_oauth_metadata(resource_url),
+        )
+        first.scopes.append("write")
+        third = await discover_oauth_metadata(resource_url)
+
+        assert mock_client.get.call_count == 2  # One RFC 8414 + RFC 9728 pair
+        assert second.token_endpoint == "https://auth.example.com/token"
+        assert third.scopes == ["read"]
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_within_event_loop() -> None:
+    """Test OAuth requests reuse one pooled client per event loop."""
+    from oneshotmcp.oauth import _get_http_client
+
+    client = _get_http_client()
+    try:
+        assert _get_http_client() is client
+    finally:
+        await client.aclose()
+
+    # A closed client is replaced rather than reused
+    replacement = _get_http_client()
+    assert replacement is not client
+    await replacement.aclose()
@@ -23,7 +23,8 @@ async def test_full_oauth_flow_with_mock_server() -> None:
     # Mock httpx to return proper OAuth discovery metadata
     with patch("httpx.AsyncClient") as mock_client_class:
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock RFC 9728 Protected Resource Metadata response
         oauth_discovery_response = Mock()
@@ -64,7 +65,8 @@ async def test_registry_oauth_required_exception() -> None:
         # Mock Smithery API response for get_server
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             # Mock server metadata response
             server_metadata_response = Mock()
@@ -133,7 +135,8 @@ async def test_registry_with_stored_tokens() -> None:
         # Mock Smithery API response
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             server_response = Mock()
             server_response.status_code = 200
@@ -224,7 +227,8 @@ async def test_self_hosted_server_no_oauth_required() -> None:
         # Mock Smithery API response for self-hosted server
         with patch("httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_client.__aenter__.return_value = mock_client
+            mock_client_class.return_value = mock_client
 
             server_response = Mock()
             server_response.status_code = 200
@@ -306,3 +310,18 @@ async def test_pkce_code_verifier_validation() -> None:
     )
 
     assert "access_token" in tokens
+
+
+def test_mock_server_stores_are_bounded() -> None:
+    """Test the mock server evicts its oldest authorization codes when full."""
+    from tests.fixtures.mock_oauth import MAX_STORED_ENTRIES
+
+    oauth_server = MockOAuthServer()
+    codes = [
+        oauth_server.create_authorization_code("test-client", "http://localhost/cb", "CHALLENGE")
+        for _ in range(MAX_STORED_ENTRIES + 1)
+    ]
+
+    assert len(oauth_server._authorization_codes) == MAX_STORED_ENTRIES
+    assert codes[0] not in oauth_server._authorization_codes
+    assert codes[-1] in oauth_server._authorization_codes
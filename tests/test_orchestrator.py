@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -318,6 +319,22 @@ def test_needs_tools_detects_no_tools() -> None:
     assert orchestrator._needs_tools(response) is True
 
 
+def test_needs_tools_no_tools_phrase_stays_on_one_line() -> None:
+    """Test the 'no ... tools ... available' phrase must not span lines."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    assert orchestrator._needs_tools("No servers are configured for this.") is True
+    assert orchestrator._needs_tools("Say no more.\nTools are available.") is False
+    # Long answers full of "no" without the phrase are rejected (in linear time)
+    assert orchestrator._needs_tools("There is no problem with the data. " * 2000) is False
+
+
 def test_needs_tools_false_on_normal_response() -> None:
     """Test that normal responses don't trigger tool detection."""
     from oneshotmcp.orchestrator import DynamicOrchestrator
@@ -375,6 +392,43 @@ def test_extract_capability_from_github() -> None:
     assert capability == "github"
 
 
+@pytest.mark.asyncio
+async def test_user_message_lowered_once_per_turn() -> None:
+    """Test explicit-request and capability detection share one lowercased message."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    class CountingStr(str):
+        lower_calls = 0
+
+        def lower(self) -> str:
+            CountingStr.lower_calls += 1
+            return super().lower()
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": HTTPServerSpec(url="http://localhost:8000/mcp")},
+        smithery_key="test_key",
+    )
+    orchestrator.graph = Mock(
+        ainvoke=AsyncMock(
+            return_value={"messages": [Mock(content="I don't have access to GitHub tools.")]}
+        )
+    )
+    discovered: list[str] = []
+
+    async def failing_discovery(capability: str) -> bool:
+        discovered.append(capability)
+        return False
+
+    orchestrator._discover_and_add_server = failing_discovery  # type: ignore[method-assign]
+
+    await orchestrator.chat(CountingStr("Use Weather MCP to check GitHub"))
+
+    # Both the explicit request and the capability were read from the message
+    assert discovered == ["weather", "github"]
+    assert CountingStr.lower_calls == 1
+
+
 def test_extract_capability_from_weather() -> None:
     """Test extraction of 'weather' capability."""
     from oneshotmcp.orchestrator import DynamicOrchestrator
@@ -434,3 +488,680 @@ def test_extract_capability_handles_multiple_keywords() -> None:
     capability = orchestrator._extract_capability(response)
     # Should extract at least one (github or weather)
     assert capability in ("github", "weather")
+
+
+@pytest.mark.asyncio
+async def test_search_with_refinement_runs_queries_concurrently() -> None:
+    """Test queries are searched concurrently, skipping ones that fail."""
+    import asyncio
+
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_search(query: str, limit: int = 10) -> list[dict[str, str]]:
+        nonlocal in_flight, peak
+        assert limit == 5
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "broken":
+            raise RuntimeError("registry error")
+        return [{"qualifiedName": "@shared/server"}, {"qualifiedName": f"@{query}/server"}]
+
+    orchestrator.smithery.search = AsyncMock(side_effect=fake_search)  # type: ignore[method-assign]
+
+    results = await orchestrator._search_with_refinement(["alpha", "broken", "beta"])
+
+    assert peak > 1
+    assert [r["qualifiedName"] for r in results] == [
+        "@shared/server",
+        "@alpha/server",
+        "@beta/server",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_enhanced_search_runs_each_phase_concurrently() -> None:
+    """Test direct patterns and fallback text queries are each searched concurrently."""
+    import asyncio
+
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    in_flight = 0
+    peak = 0
+    searched: list[str] = []
+
+    async def fake_search(query: str, limit: int = 10) -> list[dict[str, str]]:
+        nonlocal in_flight, peak
+        assert limit == 5
+        searched.append(query)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "@smithery/vercel":
+            raise RuntimeError("registry error")
+        return [{"qualifiedName": "@vercel/mcp"}]
+
+    orchestrator.smithery.search = AsyncMock(side_effect=fake_search)  # type: ignore[method-assign]
+
+    results = await orchestrator._enhanced_search_for_capability("vercel")
+
+    assert peak > 1
+    assert searched[:2] == ["@vercel", "@smithery/vercel"]
+    assert sorted(searched[2:]) == ["vercel", "vercel mcp", "vercel server"]
+    assert [r["qualifiedName"] for r in results] == ["@vercel/mcp"]
+
+
+@pytest.mark.asyncio
+async def test_search_with_refinement_caps_unique_candidates() -> None:
+    """Test collection stops once enough unique candidates are found."""
+    from oneshotmcp.orchestrator import MAX_SEARCH_CANDIDATES, DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    async def fake_search(query: str, limit: int = 10) -> list[dict[str, str]]:
+        return [{"qualifiedName": f"@{query}/server-{i}"} for i in range(limit)]
+
+    orchestrator.smithery.search = AsyncMock(side_effect=fake_search)  # type: ignore[method-assign]
+
+    queries = [f"q{i}" for i in range(10)]
+    results = await orchestrator._search_with_refinement(queries)
+
+    assert len(results) == MAX_SEARCH_CANDIDATES
+    assert results[0]["qualifiedName"] == "@q0/server-0"
+
+
+def test_extract_response_text_handles_content_shapes() -> None:
+    """Test text extraction from string, part-list and unknown message content."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    def extract(content: object) -> str:
+        return orchestrator._extract_response_text({"messages": [Mock(content=content)]})
+
+    assert extract("plain") == "plain"
+    assert extract([{"type": "text", "text": "first"}, {"text": "second"}]) == "first"
+    assert extract([{"type": "tool_use", "id": "1"}]) == "[{'type': 'tool_use', 'id': '1'}]"
+    assert extract(["not a dict"]).startswith("<Mock")
+    assert extract([]).startswith("<Mock")
+    assert orchestrator._extract_response_text({"messages": []}) == ""
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_reused_until_closed() -> None:
+    """Test metadata fetches share one pooled client until aclose()."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    client = orchestrator._get_http_client()
+    assert orchestrator._get_http_client() is client
+
+    await orchestrator.aclose()
+    assert client.is_closed
+    assert orchestrator._get_http_client() is not client
+    await orchestrator.aclose()
+
+
+def test_extract_capability_prefers_earlier_capability() -> None:
+    """Test capability priority, not position in the text, decides the match."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    assert orchestrator._extract_capability("Search my email for the GitHub invite") == "github"
+    # Overlapping keywords: "messaging" (slack) shares a "g" with "github"
+    assert orchestrator._extract_capability("messagingithub") == "github"
+
+
+def test_extract_capability_regex_fallback_matches_automaton(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the regex fallback picks the same capability as the Aho-Corasick scan."""
+    from oneshotmcp import orchestrator as orchestrator_module
+
+    pytest.importorskip("ahocorasick")
+
+    orchestrator = orchestrator_module.DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+    responses = [
+        "Search my email for the GitHub invite",
+        "messagingithub",
+        "I can't check the forecast or book an appointment",
+        "Nothing relevant here",
+        "Open a ticket in the issue tracker about the SQL queries",
+    ]
+
+    with_automaton = [orchestrator._extract_capability(r) for r in responses]
+    monkeypatch.setattr(orchestrator_module, "_CAPABILITY_AUTOMATON", None)
+    with_regex = [orchestrator._extract_capability(r) for r in responses]
+
+    assert with_automaton == with_regex == ["github", "github", "weather", None, "database"]
+
+
+@pytest.mark.asyncio
+async def test_try_candidates_prefetches_metadata_in_rank_order() -> None:
+    """Test candidate metadata is fetched up front while installs stay in rank order."""
+    from oneshotmcp.config import StdioServerSpec
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    fetched: list[str] = []
+
+    async def fake_fetch(qualified_name: str) -> dict[str, str]:
+        fetched.append(qualified_name)
+        return {"qualifiedName": qualified_name}
+
+    attempted: list[str] = []
+
+    async def fake_attempt(smithery_metadata: dict[str, str], user_config: dict[str, str]):
+        assert user_config == {}
+        attempted.append(smithery_metadata["qualifiedName"])
+        # Every prefetch has started before the first install attempt runs
+        assert fetched == ["@first/server", "@second/server"]
+        if smithery_metadata["qualifiedName"] == "@second/server":
+            return StdioServerSpec(command="npx", args=["-y", "@second/server"])
+        return None
+
+    orchestrator._fetch_local_metadata = fake_fetch  # type: ignore[method-assign]
+    orchestrator._installer = Mock(attempt_local_installation=fake_attempt)
+    orchestrator.smithery.get_server = AsyncMock(side_effect=RuntimeError("no hosted"))  # type: ignore[method-assign]
+
+    success = await orchestrator._try_candidates(
+        [{"qualifiedName": "@first/server"}, {"qualifiedName": "@second/server"}],
+        "test",
+    )
+
+    assert success is True
+    assert attempted == ["@first/server", "@second/server"]
+    assert orchestrator.servers["test"].args == ["-y", "@second/server"]
+
+
+@pytest.mark.asyncio
+async def test_try_candidates_uses_search_info_with_connections() -> None:
+    """Test search results that already include connections skip the metadata GET."""
+    from oneshotmcp.config import StdioServerSpec
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    search_info = {"qualifiedName": "@full/server", "connections": []}
+    orchestrator._fetch_local_metadata = AsyncMock()  # type: ignore[method-assign]
+    installer = Mock(
+        attempt_local_installation=AsyncMock(
+            return_value=StdioServerSpec(command="npx", args=["-y", "@full/server"])
+        )
+    )
+    orchestrator._installer = installer
+
+    success = await orchestrator._try_candidates([search_info], "test")
+
+    assert success is True
+    orchestrator._fetch_local_metadata.assert_not_called()
+    installer.attempt_local_installation.assert_awaited_once_with(
+        smithery_metadata=search_info, user_config={}
+    )
+
+
+@pytest.mark.asyncio
+async def test_research_results_are_cached_per_capability() -> None:
+    """Test repeat research for a capability doesn't rebuild the research agent."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"tavily": HTTPServerSpec(url="https://tavily.example/mcp")},
+        smithery_key="test_key",
+    )
+    orchestrator._extract_keywords_with_llm = AsyncMock(return_value=["context7"])  # type: ignore[method-assign]
+
+    research_graph = AsyncMock()
+    research_graph.ainvoke.return_value = {"messages": [Mock(content="Context7 is a docs tool.")]}
+
+    with patch("oneshotmcp.agent.build_deep_agent") as mock_build:
+        mock_build.return_value = (research_graph, Mock())
+
+        first = await orchestrator._research_capability("context7")
+        second = await orchestrator._research_capability("Context7")
+
+    assert first == {"description": "Context7 is a docs tool.", "keywords": ["context7"]}
+    assert second == first
+    mock_build.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_research_graph_is_reused_until_tavily_spec_changes() -> None:
+    """Test the research agent is built once and rebuilt when Tavily is replaced."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"tavily": HTTPServerSpec(url="https://tavily.example/mcp")},
+        smithery_key="test_key",
+    )
+
+    with patch("oneshotmcp.agent.build_deep_agent") as mock_build:
+        mock_build.side_effect = lambda **_: (Mock(), Mock())
+
+        graph = await orchestrator._get_research_graph()
+        assert await orchestrator._get_research_graph() is graph
+        assert mock_build.call_count == 1
+
+        orchestrator.servers["tavily"] = HTTPServerSpec(url="https://tavily.example/v2/mcp")
+        assert await orchestrator._get_research_graph() is not graph
+        assert mock_build.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_agent_skips_rebuild_when_servers_unchanged() -> None:
+    """Test the agent is only rebuilt when the server set actually changed."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    spec = HTTPServerSpec(url="http://localhost:8000/mcp", transport="http")
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": spec},
+        smithery_key="test_key",
+    )
+
+    with patch("oneshotmcp.orchestrator.build_deep_agent") as mock_build:
+        mock_build.return_value = (AsyncMock(), Mock())
+
+        await orchestrator._refresh_agent()
+        orchestrator.servers["math"] = spec  # Re-adding the same server
+        await orchestrator._refresh_agent()
+        assert mock_build.call_count == 1
+
+        orchestrator.servers["github"] = HTTPServerSpec(url="http://localhost:8001/mcp")
+        await orchestrator._refresh_agent()
+        assert mock_build.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("overlap_discovery", "expected_events"),
+    [
+        (True, ["invoke-start", "discovery-failed", "invoke-end"]),
+        (False, ["discovery-failed", "invoke-start", "invoke-end"]),
+    ],
+)
+async def test_explicit_discovery_overlaps_with_current_agent(
+    overlap_discovery: bool, expected_events: list[str]
+) -> None:
+    """Test the current agent answers during explicit discovery only when opted in."""
+    import asyncio
+
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": HTTPServerSpec(url="http://localhost:8000/mcp")},
+        smithery_key="test_key",
+        overlap_discovery=overlap_discovery,
+    )
+
+    events: list[str] = []
+
+    async def fake_invoke(state: dict[str, list[dict[str, str]]]) -> dict[str, list[Mock]]:
+        events.append("invoke-start")
+        await asyncio.sleep(0.01)
+        events.append("invoke-end")
+        return {"messages": [Mock(content=f"answer to {len(state['messages'])} message(s)")]}
+
+    async def failing_discovery(capability: str) -> bool:
+        assert capability == "github"
+        await asyncio.sleep(0)
+        events.append("discovery-failed")
+        return False
+
+    orchestrator.graph = Mock(ainvoke=AsyncMock(side_effect=fake_invoke))
+    orchestrator._discover_and_add_server = failing_discovery  # type: ignore[method-assign]
+
+    response = await orchestrator.chat("use github mcp to list repos")
+
+    assert response == "answer to 1 message(s)"
+    assert events == expected_events
+    orchestrator.graph.ainvoke.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_chat_cold_start_goes_straight_to_discovery() -> None:
+    """Test a chat with no servers discovers the capability and answers once."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    async def fake_discovery(capability: str) -> bool:
+        assert capability == "weather"
+        orchestrator.servers["weather"] = HTTPServerSpec(url="http://localhost:8000/mcp")
+        return True
+
+    async def fake_refresh() -> None:
+        orchestrator.graph = Mock(
+            ainvoke=AsyncMock(return_value={"messages": [Mock(content="It is sunny.")]})
+        )
+
+    orchestrator._discover_and_add_server = fake_discovery  # type: ignore[method-assign]
+    orchestrator._refresh_agent = fake_refresh  # type: ignore[method-assign]
+
+    with patch.object(orchestrator, "_needs_tools") as mock_needs_tools:
+        response = await orchestrator.chat("What's the weather in Paris?")
+
+    assert response == "It is sunny."
+    mock_needs_tools.assert_not_called()
+    assert orchestrator.messages == [
+        {"role": "user", "content": "What's the weather in Paris?"},
+        {"role": "assistant", "content": "It is sunny."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_explicit_discovery_discards_stale_answer_after_rebuild() -> None:
+    """Test the speculative answer is cancelled when discovery rebuilds the agent."""
+    import asyncio
+
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": HTTPServerSpec(url="http://localhost:8000/mcp")},
+        smithery_key="test_key",
+        overlap_discovery=True,
+    )
+
+    stale_started = asyncio.Event()
+
+    async def slow_invoke(state: dict[str, list[dict[str, str]]]) -> dict[str, list[Mock]]:
+        assert state["messages"]
+        stale_started.set()
+        await asyncio.sleep(10)
+        raise AssertionError("stale answer should have been cancelled")
+
+    stale_graph = Mock(ainvoke=AsyncMock(side_effect=slow_invoke))
+    fresh_graph = Mock(
+        ainvoke=AsyncMock(return_value={"messages": [Mock(content="repos listed")]})
+    )
+
+    async def successful_discovery(capability: str) -> bool:
+        await stale_started.wait()
+        orchestrator.servers[capability] = HTTPServerSpec(url="http://localhost:8001/mcp")
+        return True
+
+    orchestrator.graph = stale_graph
+    orchestrator._built_servers = dict(orchestrator.servers)
+    orchestrator._discover_and_add_server = successful_discovery  # type: ignore[method-assign]
+
+    with patch("oneshotmcp.orchestrator.build_deep_agent", return_value=(fresh_graph, Mock())):
+        response = await orchestrator.chat("use github mcp to list repos")
+
+    assert response == "repos listed"
+    fresh_graph.ainvoke.assert_called_once()
+
+
+def test_history_window_limits_agent_input() -> None:
+    """Test only recent messages within the history limits are sent to the agent."""
+    from oneshotmcp import orchestrator as orchestrator_module
+
+    orchestrator = orchestrator_module.DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    for i in range(orchestrator_module.MAX_HISTORY_MESSAGES):
+        orchestrator.messages.append({"role": "user", "content": f"question {i}"})
+        orchestrator.messages.append({"role": "assistant", "content": f"answer {i}"})
+    orchestrator.messages.append({"role": "user", "content": "latest"})
+
+    window = orchestrator._history_window()
+    assert len(window) == orchestrator_module.MAX_HISTORY_MESSAGES - 1
+    assert window[0]["role"] == "user"
+    assert window[-1]["content"] == "latest"
+    assert len(orchestrator.messages) == 2 * orchestrator_module.MAX_HISTORY_MESSAGES + 1
+
+    # One oversized message crowds out everything before it, but is always kept
+    huge = "x" * (orchestrator_module.MAX_HISTORY_TOKENS * 4 + 1)
+    orchestrator.messages.append({"role": "assistant", "content": "ok"})
+    orchestrator.messages.append({"role": "user", "content": huge})
+    assert orchestrator._history_window() == [{"role": "user", "content": huge}]
+
+
+@pytest.mark.asyncio
+async def test_memoized_reply_skips_identical_retry() -> None:
+    """Test a retry with unchanged agent and history reuses the memoized reply."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    spec = HTTPServerSpec(url="http://localhost:8000/mcp")
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"github": spec},
+        smithery_key="test_key",
+        memoize_responses=True,
+    )
+    graph = Mock(
+        ainvoke=AsyncMock(
+            return_value={"messages": [Mock(content="I don't have access to GitHub")]}
+        )
+    )
+    orchestrator.graph = graph
+    orchestrator._built_servers = dict(orchestrator.servers)
+
+    async def rediscover_same_server(capability: str) -> bool:
+        orchestrator.servers[capability] = spec  # Already configured, agent unchanged
+        return True
+
+    orchestrator._discover_and_add_server = rediscover_same_server  # type: ignore[method-assign]
+
+    response = await orchestrator.chat("Show my GitHub repositories")
+
+    assert response == "I don't have access to GitHub"
+    graph.ainvoke.assert_called_once()
+    assert [m["role"] for m in orchestrator.messages] == ["user", "assistant"]
+
+
+@pytest.mark.asyncio
+async def test_hosted_attempt_reuses_local_metadata_fetch() -> None:
+    """Test the hosted fallback gets the metadata the local attempt already fetched."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    metadata = {"qualifiedName": "@hosted/server", "connections": [{"type": "http"}]}
+    orchestrator._fetch_local_metadata = AsyncMock(return_value=metadata)  # type: ignore[method-assign]
+    orchestrator._installer = Mock(attempt_local_installation=AsyncMock(return_value=None))
+    hosted_spec = HTTPServerSpec(url="https://example.com/mcp")
+    orchestrator.smithery.get_server = AsyncMock(return_value=hosted_spec)  # type: ignore[method-assign]
+
+    success = await orchestrator._try_candidates([{"qualifiedName": "@hosted/server"}], "hosted")
+
+    assert success is True
+    assert orchestrator.servers["hosted"] is hosted_spec
+    orchestrator._fetch_local_metadata.assert_awaited_once_with("@hosted/server")
+    orchestrator.smithery.get_server.assert_awaited_once_with("@hosted/server", metadata=metadata)
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_yields_text_and_records_final_message() -> None:
+    """Test streamed text is yielded as it arrives and the last message is recorded."""
+    from types import SimpleNamespace
+
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": HTTPServerSpec(url="http://localhost:8000/mcp")},
+        smithery_key="test_key",
+    )
+
+    chunks = [
+        SimpleNamespace(type="AIMessageChunk", id="step", content="Let me add. "),
+        SimpleNamespace(type="AIMessageChunk", id="step", content=""),  # Tool call
+        SimpleNamespace(type="tool", id="result", content="4"),
+        SimpleNamespace(type="AIMessageChunk", id="final", content="2 + 2 "),
+        SimpleNamespace(type="AIMessageChunk", id="final", content=[{"type": "text", "text": "is 4."}]),
+    ]
+
+    async def fake_astream(state: dict[str, list[dict[str, str]]], stream_mode: str):  # type: ignore[no-untyped-def]
+        assert stream_mode == "messages"
+        assert state["messages"][-1]["content"] == "What is 2 + 2?"
+        for chunk in chunks:
+            yield chunk, {}
+
+    orchestrator.graph = SimpleNamespace(astream=fake_astream)
+
+    streamed = [text async for text in orchestrator.chat_stream("What is 2 + 2?")]
+
+    assert streamed == ["Let me add. ", "2 + 2 ", "is 4."]
+    assert orchestrator.messages[-1] == {"role": "assistant", "content": "2 + 2 is 4."}
+
+
+def _streaming_graph(*texts: str) -> Any:
+    """Graph whose astream yields `texts` as chunks of one assistant message."""
+    from types import SimpleNamespace
+
+    async def fake_astream(_state: dict[str, list[dict[str, str]]], stream_mode: str):  # type: ignore[no-untyped-def]
+        assert stream_mode == "messages"
+        for text in texts:
+            yield SimpleNamespace(type="AIMessageChunk", id="reply", content=text), {}
+
+    return SimpleNamespace(astream=fake_astream)
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_discovers_then_streams_only_the_retry() -> None:
+    """Test a missing-tools reply is held back and replaced by the retried reply."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={"math": HTTPServerSpec(url="http://localhost:8000/mcp")},
+        smithery_key="test_key",
+    )
+    orchestrator.graph = _streaming_graph("I don't have access ", "to GitHub.")
+
+    async def fake_discovery(capability: str) -> bool:
+        assert capability == "github"
+        orchestrator.servers["github"] = HTTPServerSpec(url="http://localhost:8001/mcp")
+        return True
+
+    async def fake_refresh() -> None:
+        orchestrator.graph = _streaming_graph("Found ", "3 repos.")
+
+    orchestrator._discover_and_add_server = fake_discovery  # type: ignore[method-assign]
+    orchestrator._refresh_agent = fake_refresh  # type: ignore[method-assign]
+
+    streamed = [text async for text in orchestrator.chat_stream("Search GitHub for repos")]
+
+    assert streamed == ["Found ", "3 repos."]
+    assert orchestrator.messages == [
+        {"role": "user", "content": "Search GitHub for repos"},
+        {"role": "assistant", "content": "Found 3 repos."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_cold_start_discovers_before_yielding() -> None:
+    """Test a stream with no servers discovers first and never yields the no-tools reply."""
+    from oneshotmcp.orchestrator import DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+
+    async def fake_discovery(capability: str) -> bool:
+        orchestrator.servers[capability] = HTTPServerSpec(url="http://localhost:8000/mcp")
+        return True
+
+    async def fake_refresh() -> None:
+        orchestrator.graph = _streaming_graph("It is ", "sunny.")
+
+    orchestrator._discover_and_add_server = fake_discovery  # type: ignore[method-assign]
+    orchestrator._refresh_agent = fake_refresh  # type: ignore[method-assign]
+
+    streamed = [text async for text in orchestrator.chat_stream("What's the weather in Paris?")]
+
+    assert streamed == ["It is ", "sunny."]
+    assert orchestrator.messages[-1] == {"role": "assistant", "content": "It is sunny."}
+
+
+@pytest.mark.asyncio
+async def test_failed_discovery_reports_every_candidate_found(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test the failure summary counts all candidates, not just the attempted ones."""
+    from oneshotmcp.orchestrator import MAX_CANDIDATE_ATTEMPTS, DynamicOrchestrator
+
+    orchestrator = DynamicOrchestrator(
+        model="openai:gpt-4",
+        initial_servers={},
+        smithery_key="test_key",
+    )
+    candidates = [
+        {"qualifiedName": f"@github/server-{i}"} for i in range(MAX_CANDIDATE_ATTEMPTS + 3)
+    ]
+    orchestrator._research_capability = AsyncMock(return_value={})  # type: ignore[method-assign]
+    orchestrator._enhanced_search_for_capability = AsyncMock(  # type: ignore[method-assign]
+        return_value=candidates
+    )
+    orchestrator._try_candidates = AsyncMock(return_value=False)  # type: ignore[method-assign]
+
+    assert await orchestrator._discover_and_add_server("github") is False
+
+    attempted = orchestrator._try_candidates.await_args.args[0]
+    assert len(attempted) == MAX_CANDIDATE_ATTEMPTS
+    assert f"Found {len(candidates)} potential matches" in capsys.readouterr().out
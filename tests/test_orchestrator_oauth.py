@@ -13,6 +13,13 @@ from oneshotmcp.orchestrator import DynamicOrchestrator
 from oneshotmcp.registry import OAuthRequired
 from tests.fixtures.mock_oauth import MockOAuthServer
 
+# Validated once; tests use it as-is or take a model_copy() with overrides
+_OAUTH_CONFIG = OAuthConfig(
+    authorization_endpoint="https://auth.smithery.ai/authorize",
+    token_endpoint="https://auth.smithery.ai/token",
+    resource="https://server.smithery.ai/test/mcp",
+)
+
 
 @pytest.mark.asyncio
 async def test_orchestrator_handles_oauth_automatically() -> None:
@@ -31,12 +38,7 @@ async def test_orchestrator_handles_oauth_automatically() -> None:
         )
 
         # Create mock OAuth config
-        oauth_config = OAuthConfig(
-            authorization_endpoint="https://auth.smithery.ai/authorize",
-            token_endpoint="https://auth.smithery.ai/token",
-            resource="https://server.smithery.ai/test/mcp",
-            scopes=["read", "write"],
-        )
+        oauth_config = _OAUTH_CONFIG.model_copy(update={"scopes": ["read", "write"]})
 
         # Create OAuthRequired exception
         oauth_exc = OAuthRequired(
@@ -119,11 +121,7 @@ async def test_orchestrator_handles_oauth_failure_gracefully() -> None:
         )
 
         # Create OAuthRequired exception
-        oauth_config = OAuthConfig(
-            authorization_endpoint="https://auth.smithery.ai/authorize",
-            token_endpoint="https://auth.smithery.ai/token",
-            resource="https://server.smithery.ai/test/mcp",
-        )
+        oauth_config = _OAUTH_CONFIG
 
         oauth_exc = OAuthRequired(
             message="OAuth required",
@@ -165,11 +163,7 @@ async def test_orchestrator_handles_browser_timeout() -> None:
             token_store=token_store,
         )
 
-        oauth_config = OAuthConfig(
-            authorization_endpoint="https://auth.smithery.ai/authorize",
-            token_endpoint="https://auth.smithery.ai/token",
-            resource="https://server.smithery.ai/test/mcp",
-        )
+        oauth_config = _OAUTH_CONFIG
 
         oauth_exc = OAuthRequired(
             message="OAuth required",
@@ -222,11 +216,7 @@ async def test_orchestrator_try_candidates_with_oauth() -> None:
         ]
 
         # Mock OAuth config
-        oauth_config = OAuthConfig(
-            authorization_endpoint="https://auth.smithery.ai/authorize",
-            token_endpoint="https://auth.smithery.ai/token",
-            resource="https://server.smithery.ai/test/mcp",
-        )
+        oauth_config = _OAUTH_CONFIG
 
         # Mock the registry to raise OAuthRequired for first server
         with patch.object(orchestrator.smithery, "get_server") as mock_get_server:
@@ -284,16 +274,8 @@ async def test_orchestrator_multiple_oauth_servers_in_session() -> None:
 
         # Mock successful OAuth for two different servers
         oauth_configs = [
-            OAuthConfig(
-                authorization_endpoint="https://auth.smithery.ai/authorize",
-                token_endpoint="https://auth.smithery.ai/token",
-                resource="https://server.smithery.ai/github/mcp",
-            ),
-            OAuthConfig(
-                authorization_endpoint="https://auth.smithery.ai/authorize",
-                token_endpoint="https://auth.smithery.ai/token",
-                resource="https://server.smithery.ai/context7/mcp",
-            ),
+            _OAUTH_CONFIG.model_copy(update={"resource": "https://server.smithery.ai/github/mcp"}),
+            _OAUTH_CONFIG.model_copy(update={"resource": "https://server.smithery.ai/context7/mcp"}),
         ]
 
         oauth_exceptions = [
@@ -395,11 +377,7 @@ async def test_orchestrator_oauth_token_exchange_failure() -> None:
             token_store=token_store,
         )
 
-        oauth_config = OAuthConfig(
-            authorization_endpoint="https://auth.smithery.ai/authorize",
-            token_endpoint="https://auth.smithery.ai/token",
-            resource="https://server.smithery.ai/test/mcp",
-        )
+        oauth_config = _OAUTH_CONFIG
 
         oauth_exc = OAuthRequired(
             message="OAuth required",
@@ -225,3 +225,34 @@ class TestRankingFilter:
 
         # All servers have score=0, should be filtered out
         assert ranked == []
+
+    def test_rank_servers_top_k_matches_full_ranking_prefix(self):
+        """Test top_k returns the same leading servers as a full ranking."""
+        orchestrator = DynamicOrchestrator(
+            model=MagicMock(),
+            initial_servers={},
+            smithery_key="fake-key",
+            verbose=False,
+        )
+
+        servers = [
+            {"qualifiedName": f"@other/server{i}", "name": "server", "description": "vercel deploys"}
+            for i in range(4)
+        ] + [
+            {"qualifiedName": "@vercel/mcp", "name": "vercel", "description": ""},
+            {"qualifiedName": "@random/server", "name": "random", "description": "Unrelated"},
+            {"qualifiedName": "@acme/vercel-tools", "name": "tools", "description": ""},
+        ]
+
+        full = orchestrator._rank_servers(capability="vercel", servers=servers, research={})
+        top = orchestrator._rank_servers(
+            capability="vercel", servers=servers, research={}, top_k=3
+        )
+
+        assert len(full) == 6
+        assert top == full[:3]
+        assert [s["qualifiedName"] for s in top] == [
+            "@vercel/mcp",
+            "@acme/vercel-tools",
+            "@other/server0",
+        ]
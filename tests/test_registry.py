@@ -45,9 +45,9 @@ async def test_search_returns_server_list() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -80,9 +80,9 @@ async def test_get_server_returns_http_spec() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -109,9 +109,9 @@ async def test_search_caches_results() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -135,6 +135,21 @@ async def test_search_caches_results() -> None:
         assert mock_client.get.call_count == 1
 
 
+@pytest.mark.asyncio
+async def test_get_server_uses_supplied_metadata() -> None:
+    """Test get_server builds the spec from supplied metadata without a request."""
+    from oneshotmcp.registry import SmitheryAPIClient
+
+    client = SmitheryAPIClient(api_key="test_key")
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        spec = await client.get_server("@smithery/github", metadata=MOCK_SERVER_METADATA)
+
+    mock_client_class.assert_not_called()
+    assert spec.url == "https://example.com/mcp/github"
+    assert spec.transport == "http"
+
+
 @pytest.mark.asyncio
 async def test_get_server_caches_results() -> None:
     """Test that get_server caches HTTPServerSpec objects."""
@@ -143,9 +158,9 @@ async def test_get_server_caches_results() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -176,12 +191,12 @@ async def test_search_handles_404() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock a 404 response
-        mock_response = AsyncMock()
+        mock_response = Mock()
         mock_response.status_code = 404
         mock_response.text = "Not found"
 
@@ -208,12 +223,12 @@ async def test_get_server_handles_404() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock a 404 response
-        mock_response = AsyncMock()
+        mock_response = Mock()
         mock_response.status_code = 404
         mock_response.text = "Not found"
 
@@ -239,10 +254,14 @@ async def test_search_handles_timeout() -> None:
 
     client = SmitheryAPIClient(api_key="test_key")
 
-    with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+    # Skip the real retry backoff (1s + 2s) but check it was requested
+    with (
+        patch("httpx.AsyncClient") as mock_client_class,
+        patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+    ):
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock timeout exception
         mock_client.get.side_effect = TimeoutException("Request timeout")
@@ -250,6 +269,8 @@ async def test_search_handles_timeout() -> None:
         with pytest.raises(RegistryError, match="failed after 3 attempts"):
             await client.search("github")
 
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [1, 2]
+
 
 @pytest.mark.asyncio
 async def test_search_handles_500_error() -> None:
@@ -261,12 +282,12 @@ async def test_search_handles_500_error() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock a 500 response
-        mock_response = AsyncMock()
+        mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal server error"
 
@@ -291,9 +312,9 @@ async def test_search_with_limit() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -321,9 +342,9 @@ async def test_empty_search_results() -> None:
     client = SmitheryAPIClient(api_key="test_key")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response with empty results - use Mock for sync methods
         mock_response = Mock()
@@ -360,9 +381,9 @@ async def test_get_server_with_sse_transport() -> None:
     }
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -387,9 +408,9 @@ async def test_client_uses_api_key() -> None:
     client = SmitheryAPIClient(api_key="secret_key_123")
 
     with patch("httpx.AsyncClient") as mock_client_class:
-        # Mock the async context manager
+        # Mock the pooled client the registry creates
         mock_client = AsyncMock()
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
 
         # Mock the GET response - use Mock for sync methods
         mock_response = Mock()
@@ -407,3 +428,75 @@ async def test_client_uses_api_key() -> None:
         headers = call_args[1]["headers"]
         assert headers is not None
         assert headers["Authorization"] == "Bearer secret_key_123"
+
+
+@pytest.mark.asyncio
+async def test_bulk_search_runs_distinct_queries_concurrently() -> None:
+    """Test bulk_search dedupes queries, uses the cache and reports failures per query."""
+    import asyncio
+
+    from httpx import HTTPStatusError
+
+    from oneshotmcp.registry import RegistryError, SmitheryAPIClient
+
+    client = SmitheryAPIClient(api_key="test_key")
+    client._search_cache["cached:5"] = [{"qualified_name": "@cached/server"}]
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client_class.return_value = mock_client
+
+        async def fake_get(url: str, params: dict[str, object], headers: dict[str, str]) -> Mock:
+            assert url.endswith("/servers")
+            assert headers["Authorization"] == "Bearer test_key"
+            await asyncio.sleep(0.01)
+            response = Mock()
+            if params["q"] == "broken":
+                response.status_code = 500
+                response.text = "boom"
+                response.raise_for_status.side_effect = HTTPStatusError(
+                    "Server Error", request=Mock(), response=response
+                )
+            else:
+                response.raise_for_status = Mock()
+                response.json.return_value = [{"qualified_name": f"@{params['q']}/server"}]
+            return response
+
+        mock_client.get = AsyncMock(side_effect=fake_get)
+
+        results = await client.bulk_search(["github", "broken", "github", "cached"])
+
+    assert list(results) == ["github", "broken", "cached"]
+    assert results["github"] == [{"qualified_name": "@github/server"}]
+    assert isinstance(results["broken"], RegistryError)
+    assert results["cached"] == [{"qualified_name": "@cached/server"}]
+    assert mock_client.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_pooled_client() -> None:
+    """Test searches and server lookups reuse one HTTP client until aclose()."""
+    from oneshotmcp.registry import SmitheryAPIClient
+
+    client = SmitheryAPIClient(api_key="test_key")
+
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_client = AsyncMock()
+        mock_client.is_closed = False
+        mock_client_class.return_value = mock_client
+
+        search_response = Mock()
+        search_response.json.return_value = MOCK_SEARCH_RESPONSE
+        server_response = Mock()
+        server_response.json.return_value = MOCK_SERVER_METADATA
+        mock_client.get = AsyncMock(side_effect=[search_response, search_response, server_response])
+
+        await client.search("github")
+        await client.search("weather")
+        await client.get_server("@smithery/github")
+
+        assert mock_client_class.call_count == 1
+        assert mock_client.get.await_count == 3
+
+        await client.aclose()
+        mock_client.aclose.assert_awaited_once()